@@ -0,0 +1,7 @@
+"""
+Benchmark suite for pydanql.
+
+- benchmarks.micro: query construction and hydration against a mocked connection.
+- benchmarks.e2e: throughput and latency against a throwaway table in a local PostgreSQL.
+- benchmarks.compare: compare two result files, e.g. of two releases.
+"""
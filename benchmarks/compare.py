@@ -0,0 +1,61 @@
+"""
+Compare two benchmark result files, e.g. of the last release and the working tree:
+
+    python -m benchmarks.compare baseline.json micro.json --threshold 0.1
+
+Exits with status 1 if any benchmark got slower by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    """
+    Load a result file.
+
+    :param path: path of a JSON file written by benchmarks.micro or benchmarks.e2e.
+    :return: dictionary mapping (name, params) to the result entry.
+    """
+    with open(path) as file:
+        data = json.load(file)
+    return {(entry['name'], json.dumps(entry['params'], sort_keys=True)): entry for entry in data['results']}
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compare the median time per call of the benchmarks present in both files.
+
+    :param baseline: results as returned by load.
+    :param current: results as returned by load.
+    :param threshold: relative slowdown reported as a regression, 0.1 is 10 percent.
+    :return: list of (name, params, baseline median, current median, ratio, regressed) tuples.
+    """
+    rows = []
+    for key, entry in current.items():
+        if key not in baseline:
+            continue
+        before, after = baseline[key]['median'], entry['median']
+        ratio = after / before if before else float('inf')
+        rows.append((entry['name'], entry['params'], before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two pydanql benchmark result files.")
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.1, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    rows = compare(load(args.baseline), load(args.current), args.threshold)
+    for name, params, before, after, ratio, regressed in rows:
+        params = ', '.join(f"{key}={value}" for key, value in params.items())
+        marker = "REGRESSION" if regressed else ""
+        print(f"{name:<40} {params:<45} {before * 1e6:>12.2f} us {after * 1e6:>12.2f} us {ratio:>7.2f}x {marker}")
+
+    sys.exit(1 if any(row[-1] for row in rows) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+End-to-end throughput and latency benchmarks against a local PostgreSQL.
+
+Every run creates a throwaway table and drops it afterwards. Connection
+arguments default to the libpq environment variables (PGHOST, PGPORT,
+PGUSER, PGPASSWORD). Run from the repository root:
+
+    python -m benchmarks.e2e --database pydanql_bench --output e2e.json
+"""
+import argparse
+import os
+from uuid import uuid4
+from pydanql.base import Database
+from pydanql.model import ObjectBaseModel
+from pydanql.table import Table
+from .harness import measure_calls, report, result
+
+
+class BenchBook(ObjectBaseModel):
+    name: str
+    author: str
+    year: int
+    rating: float
+
+
+def make_book(index):
+    """
+    Build an unsaved book.
+
+    :param index: book number.
+    :return: BenchBook instance.
+    """
+    return BenchBook(name=f"Book {index}", author=f"Author {index % 100}", year=1900 + index % 120, rating=index % 5)
+
+
+def run(database, rows=10000, calls=1000, batch_size=1000, **connect_kwargs):
+    """
+    Run the end-to-end benchmarks.
+
+    :param database: name of the database to connect to.
+    :param rows: number of rows loaded before the read benchmarks.
+    :param calls: number of timed calls per benchmark.
+    :param batch_size: rows per add_many call.
+    :param connect_kwargs: user, password, host and port.
+    :return: list of result entries.
+    """
+    db = Database(database=database, **connect_kwargs)
+    table = Table(db, BenchBook, table_name=f"bench_books_{uuid4().hex[:8]}")
+    results = []
+
+    try:
+        results.append(result('add', measure_calls(lambda index: table.add(make_book(index)), calls)))
+
+        batches = max(1, rows // batch_size)
+        results.append(result('add_many', measure_calls(
+            lambda index: table.add_many([make_book(index * batch_size + offset) for offset in range(batch_size)]),
+            batches, rows_per_call=batch_size,
+        ), batch_size=batch_size))
+
+        results.append(result('find_many', measure_calls(
+            lambda index: table.find_many(count=100, author=f"Author {index % 100}"), calls, rows_per_call=100,
+        ), count=100, filtered=True))
+        results.append(result('find_many', measure_calls(
+            lambda index: table.find_many(count=100, sort='-year', as_='tuples'), calls, rows_per_call=100,
+        ), count=100, as_='tuples'))
+
+        results.append(result('page', measure_calls(
+            lambda index: table.page(page_number=index % 50 + 1, page_size=20), calls, rows_per_call=20,
+        ), page_size=20))
+
+        results.append(result('count', measure_calls(lambda index: table.count(), calls)))
+        results.append(result('count', measure_calls(
+            lambda index: table.count(year={'gt': 1900 + index % 120}), calls,
+        ), filtered=True))
+
+        books = table.find_many(count=calls)
+        def replace(index):
+            book = books[index % len(books)]
+            book.rating = index % 5
+            table.replace(book)
+        results.append(result('replace', measure_calls(replace, calls)))
+
+        results.append(result('replace_many', measure_calls(
+            lambda index: table.replace_many(books), 10, rows_per_call=len(books),
+        ), rows=len(books)))
+
+    finally:
+        db.execute(f"DROP TABLE IF EXISTS {table.name}")
+        db.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pydanql end-to-end benchmarks.")
+    parser.add_argument('--database', default=os.environ.get('PGDATABASE', 'pydanql_bench'))
+    parser.add_argument('--host', default=os.environ.get('PGHOST'))
+    parser.add_argument('--port', default=os.environ.get('PGPORT'))
+    parser.add_argument('--user', default=os.environ.get('PGUSER'))
+    parser.add_argument('--password', default=os.environ.get('PGPASSWORD'))
+    parser.add_argument('--rows', type=int, default=10000, help="rows loaded before the read benchmarks")
+    parser.add_argument('--calls', type=int, default=1000, help="timed calls per benchmark")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(
+        args.database, rows=args.rows, calls=args.calls,
+        host=args.host, port=args.port, user=args.user, password=args.password,
+    )
+    report('e2e', results, args.output)
+
+
+if __name__ == '__main__':
+    main()
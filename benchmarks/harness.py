@@ -0,0 +1,123 @@
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+
+
+def measure(func, repeat=5):
+    """
+    Time a fast function with timeit.
+
+    :param func: callable without arguments.
+    :param repeat: number of timing runs, each looping func enough times to take at least 0.2 seconds.
+    :return: dictionary with loops per run and min, median and mean seconds per call.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min': min(per_call),
+        'median': statistics.median(per_call),
+        'mean': statistics.mean(per_call),
+        'ops_per_sec': 1 / statistics.median(per_call),
+    }
+
+
+def measure_calls(func, calls, rows_per_call=1):
+    """
+    Time every single call of a slow function, e.g. a database round trip.
+
+    :param func: callable taking the call index.
+    :param calls: number of calls.
+    :param rows_per_call: rows handled per call, used for the rows per second throughput.
+    :return: dictionary with latency percentiles in seconds and throughput.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for index in range(calls):
+        call_start = time.perf_counter()
+        func(index)
+        latencies.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+    return {
+        'number': calls,
+        'repeat': 1,
+        'min': latencies[0],
+        'median': statistics.median(latencies),
+        'mean': statistics.mean(latencies),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'max': latencies[-1],
+        'ops_per_sec': calls / total,
+        'rows_per_sec': calls * rows_per_call / total,
+    }
+
+
+def result(name, stats, **params):
+    """
+    Build one benchmark result entry.
+
+    :param name: benchmark name.
+    :param stats: dictionary returned by measure or measure_calls.
+    :param params: parameters of the benchmark, e.g. rows or model width.
+    :return: dictionary with name, params and stats.
+    """
+    return {'name': name, 'params': params, **stats}
+
+
+def environment():
+    """
+    Describe the environment the benchmarks ran in.
+
+    :return: dictionary with timestamp, versions, platform and git commit.
+    """
+    try:
+        from importlib.metadata import version
+        pydanql_version = version('pydanql')
+    except Exception:
+        pydanql_version = None
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'pydanql': pydanql_version,
+        'commit': commit,
+    }
+
+
+def report(suite, results, output=None):
+    """
+    Print a summary table and optionally write the results as JSON.
+
+    :param suite: name of the suite.
+    :param results: list of result entries.
+    :param output: path of the JSON file to write, None only prints.
+    """
+    for entry in results:
+        params = ', '.join(f"{key}={value}" for key, value in entry['params'].items())
+        print(f"{entry['name']:<40} {params:<45} {entry['median'] * 1e6:>12.2f} us {entry['ops_per_sec']:>14.1f} ops/s")
+
+    if output:
+        with open(output, 'w') as file:
+            json.dump({'suite': suite, 'environment': environment(), 'results': results}, file, indent=2)
+        print(f"Results written to {output}")
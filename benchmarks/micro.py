@@ -0,0 +1,132 @@
+"""
+Microbenchmarks of query construction and hydration against a mocked connection.
+
+Run from the repository root:
+
+    python -m benchmarks.micro --output micro.json
+"""
+import argparse
+from unittest.mock import MagicMock, patch
+from pydantic import create_model
+from pydanql.base import Database
+from pydanql.model import ObjectBaseModel
+from pydanql.table import Table
+from .harness import measure, report, result
+
+# Number of user defined fields of the narrow and wide benchmark models
+WIDTHS = (3, 20)
+ROW_COUNTS = (10, 1000, 10000)
+QUICK_ROW_COUNTS = (10, 1000)
+
+RAW_QUERY = """
+    SELECT id, name, author, year
+    FROM Books
+    WHERE author = %s
+      AND year > %s
+    ORDER BY year DESC
+    LIMIT %s
+"""
+
+
+def make_model(width):
+    """
+    Create a model with the given number of int, str and float fields on top of ObjectBaseModel.
+
+    :param width: number of user defined fields.
+    :return: the model class.
+    """
+    types = (int, str, float)
+    fields = {f"field_{index}": (types[index % 3], ...) for index in range(width)}
+    return create_model(f"Width{width}", __base__=ObjectBaseModel, **fields)
+
+
+def make_row(model, index):
+    """
+    Build a row as the driver would return it for the model.
+
+    :param model: the model class.
+    :param index: row number, used as id.
+    :return: tuple in column order.
+    """
+    values = {int: index, str: f"value {index}", float: index / 3}
+    row = [index, None, None, f"slug{index}"]
+    for name, field in model.model_fields.items():
+        if name.startswith('field_'):
+            row.append(values[field.annotation])
+    return tuple(row)
+
+
+def make_database():
+    """
+    Create a Database whose connection is a MagicMock.
+
+    :return: the Database and the mocked cursor.
+    """
+    conn = MagicMock(closed=0)
+    with patch('psycopg2.connect', return_value=conn):
+        db = Database()
+    return db, conn.cursor.return_value
+
+
+def run(quick=False, name_filter=None):
+    """
+    Run the microbenchmarks.
+
+    :param quick: use fewer row counts.
+    :param name_filter: only run benchmarks whose name contains this string.
+    :return: list of result entries.
+    """
+    results = []
+
+    def add(name, func, **params):
+        if name_filter is None or name_filter in name:
+            results.append(result(name, measure(func), **params))
+
+    db, cursor = make_database()
+
+    add('clean_query', lambda: db._clean_query(RAW_QUERY), compiled=False)
+    compiled = db._clean_query(RAW_QUERY)
+    add('clean_query', lambda: db._clean_query(compiled), compiled=True)
+
+    for width in WIDTHS:
+        model = make_model(width)
+        table = Table(db, model)
+        obj = model(**dict(zip(table.columns, make_row(model, 1)))).model_copy(update={'id': None})
+
+        add('construct_where_clause', lambda: table._construct_where_clause(field_0=1), width=width, filters=1)
+        add('construct_where_clause', lambda: table._construct_where_clause(
+            field_0={'range': (1, 10)}, field_1={'like': 'value*'}, slug={'in': ['a', 'b', 'c']},
+        ), width=width, filters=3)
+        add('construct_query_for_insert_or_replace', lambda: table._construct_query_for_insert_or_replace(obj),
+            width=width, replace=False)
+        add('construct_query_for_insert_or_replace', lambda: table._construct_query_for_insert_or_replace(obj, replace=True),
+            width=width, replace=True)
+
+        for rows in (QUICK_ROW_COUNTS if quick else ROW_COUNTS):
+            data = [make_row(model, index) for index in range(rows)]
+            trusted_table = Table(db, model, trusted=True)
+
+            def find_many(target=table, as_='models'):
+                cursor.fetchall.return_value = data
+                return target.find_many(as_=as_)
+
+            add('find_many', find_many, width=width, rows=rows, as_='models', trusted=False)
+            add('find_many', lambda: find_many(trusted_table), width=width, rows=rows, as_='models', trusted=True)
+            add('find_many', lambda: find_many(as_='dicts'), width=width, rows=rows, as_='dicts', trusted=False)
+            add('find_many', lambda: find_many(as_='tuples'), width=width, rows=rows, as_='tuples', trusted=False)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pydanql microbenchmarks.")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--quick', action='store_true', help="use fewer row counts")
+    parser.add_argument('--filter', dest='name_filter', help="only run benchmarks whose name contains this string")
+    args = parser.parse_args()
+
+    report('micro', run(args.quick, args.name_filter), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,579 @@
+import asyncio
+import logging
+from datetime import datetime
+from pydantic import ValidationError
+from .base import Database
+from .errors import DatabaseError
+from .instrumentation import Instrumentation
+from .cache import MISSING
+from .table import Table
+
+try:
+    import psycopg
+    from psycopg.types.json import Jsonb
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # pragma: no cover - optional dependency
+    psycopg = None
+    Jsonb = None
+    AsyncConnectionPool = None
+
+
+class AsyncDatabase:
+    """
+    AsyncDatabase class to manage PostgreSQL database operations from asyncio code.
+    Backed by psycopg 3 and its async connection pool, so many queries can run
+    concurrently on one event loop.
+    """
+
+    _clean_query = Database._clean_query
+
+    def __init__(self, database='app_db', pool_min=1, pool_max=10, pool_timeout=30.0, slow_query_threshold=None, **kwargs):
+        """
+        Initialize AsyncDatabase class. Call `await db.open()` or use `async with`
+        before running queries.
+
+        :param database: name of the database to connect to.
+        :param pool_min: number of connections kept open by the pool.
+        :param pool_max: maximum number of connections checked out at the same time.
+        :param pool_timeout: seconds to wait for a free connection.
+        :param slow_query_threshold: seconds after which a query is logged as a warning.
+        :param kwargs: additional keyword arguments like user, password, host, and port.
+        """
+        if psycopg is None:
+            raise DatabaseError("AsyncDatabase requires psycopg 3, install it with 'pip install pydanql[async]'.")
+
+        # Initialize the logger for this class
+        self.logger = logging.getLogger(__name__)
+
+        # Query hooks, slow query log and latency histograms
+        self.instrumentation = Instrumentation(slow_query_threshold=slow_query_threshold, logger=self.logger)
+
+        conninfo = psycopg.conninfo.make_conninfo(
+            dbname=database,
+            user=kwargs.get('user'),
+            password=kwargs.get('password'),
+            host=kwargs.get('host'),
+            port=kwargs.get('port')
+        )
+        self.pool = AsyncConnectionPool(
+            conninfo, min_size=pool_min, max_size=pool_max, timeout=pool_timeout, open=False
+        )
+
+        # Tables set up on this database by model, used to resolve relationships
+        self.tables = {}
+
+    async def open(self):
+        """
+        Open the connection pool.
+        """
+        try:
+            await self.pool.open(wait=True)
+
+            # Log a successful database connection
+            self.logger.info("Database connection established.")
+
+        except Exception as e:
+            # Log the exception if database connection fails
+            self.logger.exception("Failed to connect to the database.")
+            raise DatabaseError(f"Failed to connect to the database.") from e
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def pool_stats(self):
+        """
+        Return connection pool statistics.
+
+        :return: dictionary with pool statistics.
+        """
+        return self.pool.get_stats()
+
+    async def execute(self, query, params=(), table=None):
+        """
+        Execute an SQL query.
+
+        :param query: SQL query as a string.
+        :param params: parameters for SQL query as a tuple.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :return: number of rows affected.
+        """
+        clean_query = self._clean_query(query)
+        event = self.instrumentation.before(clean_query, params, table, 'execute')
+        try:
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(clean_query, params)
+                rowcount = cursor.rowcount
+
+        except Exception as e:
+            self.instrumentation.after(event, error=e)
+            # Log the exception if query execution fails
+            self.logger.exception("Failed to execute query.")
+            raise DatabaseError(f"Failed to execute query.") from e
+
+        self.instrumentation.after(event, rowcount=rowcount)
+        return rowcount
+
+    async def execute_many(self, query, params_list, page_size=100, fetch=False, table=None):
+        """
+        Execute an SQL query for many rows using a multi-row VALUES list.
+
+        :param query: SQL query as a string containing a single VALUES %s placeholder.
+        :param params_list: sequence of parameter tuples, one per row.
+        :param page_size: maximum number of rows per statement.
+        :param fetch: whether to return the rows produced by a RETURNING clause.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :return: fetched data as a list of tuples if fetch is set, else None.
+        """
+        clean_query = self._clean_query(query)
+        pre, post = clean_query.split('%s', 1)
+        result = []
+        event = self.instrumentation.before(clean_query, params_list, table, 'execute_many')
+        try:
+            async with self.pool.connection() as conn:
+                async with conn.transaction():
+                    for start in range(0, len(params_list), page_size):
+                        page = params_list[start:start + page_size]
+                        values = ', '.join('(' + ', '.join(['%s'] * len(row)) + ')' for row in page)
+                        cursor = await conn.execute(pre + values + post, [value for row in page for value in row])
+                        if fetch:
+                            result.extend(await cursor.fetchall())
+
+        except Exception as e:
+            self.instrumentation.after(event, error=e)
+            # Log the exception if query execution fails
+            self.logger.exception("Failed to execute query.")
+            raise DatabaseError(f"Failed to execute query.") from e
+
+        self.instrumentation.after(event, rowcount=len(params_list))
+        return result if fetch else None
+
+    async def fetch(self, query, params=(), table=None):
+        """
+        Fetch data from the database using an SQL query.
+
+        :param query: SQL query as a string.
+        :param params: parameters for SQL query as a tuple.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :return: fetched data as a list of tuples.
+        """
+        clean_query = self._clean_query(query)
+        event = self.instrumentation.before(clean_query, params, table, 'fetch')
+        try:
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(clean_query, params)
+                result = await cursor.fetchall()
+
+        except Exception as e:
+            self.instrumentation.after(event, error=e)
+            # Log the exception if fetching fails
+            self.logger.exception("Failed to fetch data.")
+            raise DatabaseError(f"Failed to fetch data.") from e
+
+        self.instrumentation.after(event, rowcount=len(result))
+        return result
+
+    async def close(self):
+        """
+        Close the connection pool.
+        """
+        try:
+            await self.pool.close()
+
+            # Log the closing operation
+            self.logger.info("Database connection closed.")
+
+        except Exception as e:
+            # Log the exception if closing the connection fails
+            self.logger.exception("Failed to close the database connection.")
+            raise DatabaseError("Failed to close the database connection.")
+
+
+class AsyncTable(Table):
+    """
+    Represents a database table accessed from asyncio code.
+
+    Shares all query construction with Table; only the execution is awaited.
+    The table is created on first use.
+    """
+
+    # psycopg 3 has its own JSON wrapper
+    JSON_ADAPTER = Jsonb
+
+    def _create_table(self):
+        """Defer table creation until the first awaited operation."""
+        self._created = False
+        # Concurrent CREATE TABLE IF NOT EXISTS can fail with a unique violation in PostgreSQL
+        self._create_lock = asyncio.Lock()
+
+    async def _ensure_table(self):
+        """Create the table and its indexes if they don't exist yet, once for all concurrent callers."""
+        if self._created:
+            return
+        async with self._create_lock:
+            if not self._created:
+                for query in self._construct_queries_for_create_table():
+                    await self.db.execute(query, table=self.name)
+                self._created = True
+
+    async def _fetch(self, query, values):
+        """
+        Fetch rows, serving repeated reads from the read cache if it is enabled.
+
+        Parameters:
+        - query: The compiled query
+        - values: Tuple of query values
+
+        Returns:
+        - List of row tuples
+        """
+        key = self._read_cache_key(query, values)
+        if key is None:
+            return await self.db.fetch(query, values, table=self.name)
+
+        rows = self.cache.get(key)
+        if rows is MISSING:
+            rows = tuple(await self.db.fetch(query, values, table=self.name))
+            self.cache.set(key, rows)
+        return list(rows)
+
+    async def find_many(self, offset=None, count=None, sort=None, as_='models', fields=None, prefetch=None, **kwargs):
+        """
+        Finds multiple records based on the given filters, sort order, and pagination options.
+
+        Parameters:
+        - offset: The offset for pagination.
+        - count: The number of records to return.
+        - sort: The column to sort the results.
+        - as_: Result format, one of 'models', 'dicts' or 'tuples'. Defaults to 'models'.
+        - fields: Optional list of columns to select. Models are then built partially, without validation.
+        - prefetch: Optional list of relation names to load with one query per relation.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A list of model instances (or dicts or tuples) that match the criteria.
+        """
+        await self._ensure_table()
+        query, values = self._construct_query_for_find_many(offset, count, sort, fields=fields, **kwargs)
+        results = await self._fetch(query, values)
+        objects = self._hydrate(results, as_, fields)
+
+        for relation in prefetch or ():
+            column, table, ids = self._prepare_for_prefetch(objects, relation, as_)
+            related = []
+            if ids:
+                await table._ensure_table()
+                related = table._hydrate(await table._fetch(table._construct_query_for_prefetch(), (ids,)))
+            self._stitch_related(objects, relation, column, related)
+        return objects
+
+    async def find_after(self, cursor=None, count=10, sort='id', as_='models', **kwargs):
+        """
+        Finds a page of records following a continuation cursor (keyset pagination).
+
+        Parameters:
+        - cursor: Continuation token returned by a previous call, None for the first page.
+        - count: The number of records to return. Defaults to 10.
+        - sort: The column to sort the results (optionally prefixed with '-' for DESC).
+        - as_: Result format, one of 'models', 'dicts' or 'tuples'. Defaults to 'models'.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A tuple of the list of model instances and the token for the next page, None on the last page.
+        """
+        await self._ensure_table()
+        query, values = self._construct_query_for_find_after(cursor, count, sort, **kwargs)
+        rows = await self.db.fetch(query, values, table=self.name)
+
+        next_cursor = None
+        if count is not None and len(rows) == count:
+            next_cursor = self._encode_cursor(rows[-1], sort)
+
+        return self._hydrate(rows, as_), next_cursor
+
+    async def find_one(self, **kwargs):
+        """
+        Finds a single record based on the given filters.
+
+        Parameters:
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A single model instance if found, else None.
+        """
+        results = await self.find_many(count=1, **kwargs)
+        return results[0] if results else None
+
+    async def count(self, **kwargs):
+        """
+        Returns the total number of records that match the given criteria.
+
+        Parameters:
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - Integer representing the total number of matching records.
+        """
+        await self._ensure_table()
+        query, values = self._construct_query_for_count(**kwargs)
+        total_records = await self._fetch(query, values)
+        return total_records[0][0] if total_records else 0
+
+    async def aggregate(self, group_by=None, sum=None, avg=None, min=None, max=None, count=False, sort=None, as_='dicts', **kwargs):
+        """
+        Computes aggregates on the server, optionally grouped by columns.
+
+        Parameters:
+        - group_by: Column or list of columns to group by.
+        - sum, avg, min, max: Column or list of columns per aggregate function.
+        - count: Whether to count the records of each group.
+        - sort: Output name to sort by (optionally prefixed with '-' for DESC).
+        - as_: Result format, 'dicts' or 'tuples'. Defaults to 'dicts'.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A list of rows with the group columns first, then 'count' and '<function>_<column>' values.
+        """
+        await self._ensure_table()
+        query, values, names = self._construct_query_for_aggregate(
+            group_by, sum=sum, avg=avg, min=min, max=max, count=count, sort=sort, **kwargs
+        )
+        results = await self._fetch(query, values)
+
+        if as_ == 'tuples':
+            return results
+        if as_ == 'dicts':
+            return [dict(zip(names, res)) for res in results]
+        raise ValueError(f"Invalid result format: {as_}, use one of dicts, tuples")
+
+    async def add(self, object):
+        """
+        Adds a new record to the table.
+
+        Parameters:
+        - object: The Pydantic model instance representing the record.
+
+        Returns:
+        - None
+        """
+        await self._ensure_table()
+        try:
+            valid_object = self._prepare_for_insert(object)
+        except ValidationError as e:
+            print(f"Validation error: {e}")
+            return
+
+        query, data = self._construct_query_for_insert_or_replace(valid_object)
+        await self.db.execute(query, data, table=self.name)
+        self._invalidate_cache()
+
+    async def add_many(self, objects, batch_size=1000, return_ids=False):
+        """
+        Adds many new records to the table using multi-row INSERT statements.
+
+        Parameters:
+        - objects: An iterable of Pydantic model instances.
+        - batch_size: Number of rows sent per INSERT statement. Defaults to 1000.
+        - return_ids: Whether to return the ids generated by the database.
+
+        Returns:
+        - A list of ids in input order if return_ids is set, else None. Invalid objects
+          are skipped and get None at their position, so the list lines up with the input.
+        """
+        await self._ensure_table()
+        ids = []
+        skipped = []
+        for query, rows in self._construct_queries_for_add_many(objects, batch_size, return_ids, skipped):
+            result = await self.db.execute_many(query, rows, page_size=len(rows), fetch=return_ids, table=self.name)
+            self._invalidate_cache()
+            if return_ids:
+                ids.extend(row[0] for row in result)
+
+        return self._align_ids(ids, skipped) if return_ids else None
+
+    async def replace(self, object):
+        """
+        Replaces an existing record in the table.
+
+        Parameters:
+        - object: The Pydantic model instance representing the new state of the record.
+
+        Returns:
+        - None
+        """
+        self._check_complete(object)
+        await self._ensure_table()
+        try:
+            query, data = self._prepare_for_replace(object)
+            await self.db.execute(query, data, table=self.name)
+            self._invalidate_cache()
+            self._mark_clean(object)
+        except Exception as e:
+            print(f"Error replacing record: {e}")
+
+    async def update(self, object):
+        """
+        Writes only the fields of a record that changed since it was loaded.
+
+        Parameters:
+        - object: The Pydantic model instance with an id.
+
+        Returns:
+        - Number of updated records, 0 if nothing changed
+        """
+        await self._ensure_table()
+        query, data = self._prepare_for_update(object)
+        if query is None:
+            return 0
+
+        updated = await self.db.execute(query, data, table=self.name)
+        self._invalidate_cache()
+        self._mark_clean(object)
+        return updated
+
+    async def update_where(self, filters, **set_values):
+        """
+        Updates all records matching the filters on the server, without loading them.
+
+        Parameters:
+        - filters: Dictionary of filtering criteria in find_many syntax, at least one is required.
+        - **set_values: Columns and their new values.
+
+        Returns:
+        - Number of updated records
+        """
+        await self._ensure_table()
+        query, values = self._construct_query_for_update_where(filters, **set_values)
+        updated = await self.db.execute(query, values, table=self.name)
+        self._invalidate_cache()
+        return updated
+
+    async def replace_many(self, objects, batch_size=1000):
+        """
+        Replaces many records in the table with multi-row upserts.
+        If the same id occurs more than once, the last object wins.
+
+        Parameters:
+        - objects: An iterable of Pydantic model instances with ids.
+        - batch_size: Number of rows sent per statement. Defaults to 1000.
+
+        Returns:
+        - Number of records written
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size should be 1 or higher")
+
+        await self._ensure_table()
+        objects = list({object.id: object for object in objects}.values())
+        now = datetime.now()
+        total = 0
+        query = self._construct_query_for_replace_batch()
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start:start + batch_size]
+            for object in batch:
+                self._check_complete(object)
+                # Updating the last edit time
+                object._date_last_edit = now
+            rows = [self._construct_row(object, self.columns) for object in batch]
+            await self.db.execute_many(query, rows, page_size=len(rows), table=self.name)
+            total += len(rows)
+
+        self._invalidate_cache()
+        return total
+
+    async def delete(self, object):
+        """
+        Deletes a record from the table.
+
+        Parameters:
+        - object: The Pydantic model instance representing the record to be deleted.
+
+        Returns:
+        - None
+        """
+        await self._ensure_table()
+        query, data = self._construct_query_for_delete(object)
+
+        try:
+            await self.db.execute(query, data, table=self.name)
+            self._invalidate_cache()
+        except Exception as e:
+            print(f"Error deleting record: {e}")
+
+    async def delete_where(self, **kwargs):
+        """
+        Deletes all records matching the given filters with a single statement.
+
+        Parameters:
+        - **kwargs: Filtering criteria, at least one is required.
+
+        Returns:
+        - Number of deleted records
+        """
+        await self._ensure_table()
+        query, values = self._construct_query_for_delete_where(**kwargs)
+        deleted = await self.db.execute(query, values, table=self.name)
+        self._invalidate_cache()
+        return deleted
+
+    async def page(self, page_number, page_size=10, **kwargs):
+        """
+        Paginates through the records in the table based on the given page number and size.
+
+        Parameters:
+        - page_number: The current page number, starts from 1.
+        - page_size: Number of records to return per page. Defaults to 10.
+        - **kwargs: Additional filtering criteria for the records.
+
+        Returns:
+        - A list of model instances representing the current page's data.
+        """
+        offset = self._construct_page_offset(page_number, page_size)
+        return await self.find_many(offset=offset, count=page_size, **kwargs)
+
+    async def page_count(self, page_size=10, **kwargs):
+        """
+        Calculates the total number of pages based on the given page size and filtering criteria.
+
+        Parameters:
+        - page_size: Number of records to return per page. Defaults to 10.
+        - **kwargs: Additional filtering criteria for the records.
+
+        Returns:
+        - Integer representing the total number of pages.
+        """
+        # Find the total number of records that match the criteria
+        total_records = await self.count(**kwargs)
+
+        # Calculate the number of pages
+        pages = total_records // page_size
+        if total_records % page_size > 0:
+            pages += 1
+
+        return pages
+
+    # AsyncDatabase has no server-side cursors, COPY, transactions or process pools,
+    # so the Table methods built on them are not available on AsyncTable
+
+    def iter_many(self, *args, **kwargs):
+        """Not supported, AsyncDatabase has no server-side cursors."""
+        raise NotImplementedError("AsyncTable does not support iter_many, page through large results with find_after")
+
+    def export(self, *args, **kwargs):
+        """Not supported, AsyncDatabase has no COPY support."""
+        raise NotImplementedError("AsyncTable does not support export, use Table.export with a Database")
+
+    def to_columns(self, *args, **kwargs):
+        """Not supported, AsyncDatabase has no server-side cursors."""
+        raise NotImplementedError("AsyncTable does not support to_columns, use Table.to_columns with a Database")
+
+    def parallel_map(self, *args, **kwargs):
+        """Not supported, worker processes connect through Database."""
+        raise NotImplementedError("AsyncTable does not support parallel_map, use Table.parallel_map with a Database")
+
+    def maintain_partitions(self, *args, **kwargs):
+        """Not supported, AsyncDatabase has no transactions."""
+        raise NotImplementedError("AsyncTable does not support maintain_partitions, use Table.maintain_partitions with a Database")
@@ -1,7 +1,34 @@
 import psycopg2
+import psycopg2.extras
 import logging
+import itertools
 import re
+import threading
+import time
+from uuid import uuid4
+from contextlib import contextmanager
 from .errors import DatabaseError
+from .instrumentation import Instrumentation
+from .pool import ConnectionPool
+
+
+class CompiledQuery(str):
+    """
+    SQL string that has already been cleaned and can be sent as is.
+    """
+    pass
+
+
+def clean_query(query):
+    """
+    Remove extra whitespaces from the query string.
+
+    :param query: SQL query as a string.
+    :return: cleaned SQL query as a CompiledQuery.
+    """
+    if isinstance(query, CompiledQuery):
+        return query
+    return CompiledQuery(re.sub(r'\s+', ' ', query).strip())
 
 class Database:
     """
@@ -9,33 +36,104 @@ class Database:
     Provides methods for executing queries and fetching results.
     """
 
-    def __init__(self, database='app_db', **kwargs):
+    def __init__(self, database='app_db', pool_min=None, pool_max=None, pool_timeout=None, pool_health_check=30,
+                 slow_query_threshold=None, schema_sync='eager', replicas=None, replica_selection='round_robin',
+                 read_your_writes=None, **kwargs):
         """
         Initialize Database class.
 
         :param database: name of the database to connect to.
+        :param pool_min: number of pooled connections opened up front, defaults to 1 when pooling.
+        :param pool_max: maximum number of pooled connections, enables pooling when set.
+        :param pool_timeout: seconds to wait for a free pooled connection, None waits forever.
+        :param pool_health_check: seconds a pooled connection may sit idle before it is pinged on checkout.
+        :param slow_query_threshold: seconds after which a query is logged as a warning.
+        :param schema_sync: 'eager' creates each table when it is set up, 'deferred' waits for sync_schema(),
+            'off' never issues DDL.
+        :param replicas: read replicas as DSN strings or dictionaries of connection arguments overriding
+            the primary's, e.g. {'host': 'replica-1'}. Reads outside transactions are routed to them.
+        :param replica_selection: 'round_robin' or 'least_loaded' (fewest checked out connections).
+        :param read_your_writes: seconds after a write during which reads of the same thread stay on the primary.
         :param kwargs: additional keyword arguments like user, password, host, and port.
         """
+        if schema_sync not in ('eager', 'deferred', 'off'):
+            raise ValueError(f"Invalid schema_sync: {schema_sync}, use one of eager, deferred, off")
+        if replica_selection not in ('round_robin', 'least_loaded'):
+            raise ValueError(f"Invalid replica_selection: {replica_selection}, use one of round_robin, least_loaded")
+        self.schema_sync = schema_sync
+        self.replica_selection = replica_selection
+        self.read_your_writes = read_your_writes
 
         # Initialize the logger for this class
         self.logger = logging.getLogger(__name__)
-        logging.basicConfig(level=logging.INFO)
+
+        # Query hooks, slow query log and latency histograms
+        self.instrumentation = Instrumentation(slow_query_threshold=slow_query_threshold, logger=self.logger)
+
+        # Arguments to open an equivalent connection, e.g. in a worker process
+        self.connect_kwargs = dict(
+            database=database,
+            user=kwargs.get('user'),
+            password=kwargs.get('password'),
+            host=kwargs.get('host'),
+            port=kwargs.get('port')
+        )
+
+        connect_kwargs = dict(
+            dbname=database,
+            user=kwargs.get('user'),
+            password=kwargs.get('password'),
+            host=kwargs.get('host'),
+            port=kwargs.get('port')
+        )
+
+        self.pool = None
+        self.conn = None
+        self.cursor = None
+        self.replicas = []
+
+        # Per-thread transaction state, see transaction()
+        self._local = threading.local()
+
+        # Tables set up on this database by model, used to resolve relationships
+        self.tables = {}
 
         try:
-            # Attempt to establish a database connection
-            self.conn = psycopg2.connect(
-                dbname=database,
-                user=kwargs.get('user'),
-                password=kwargs.get('password'),
-                host=kwargs.get('host'),
-                port=kwargs.get('port')
-            )
-            # Create a cursor object
-            self.cursor = self.conn.cursor()
+            if pool_max:
+                # Attempt to open a pool of database connections
+                self.pool = ConnectionPool(
+                    1 if pool_min is None else pool_min, pool_max,
+                    health_check_after=pool_health_check,
+                    timeout=pool_timeout,
+                    **connect_kwargs
+                )
+            else:
+                # Attempt to establish a database connection
+                self.conn = psycopg2.connect(**connect_kwargs)
+                # Create a cursor object
+                self.cursor = self.conn.cursor()
+
+            for replica in replicas or ():
+                # Replicas are always pooled, reads from many threads may share them
+                if isinstance(replica, str):
+                    replica_kwargs = dict(dsn=replica)
+                else:
+                    replica_kwargs = dict(connect_kwargs, **replica)
+                    if 'database' in replica_kwargs:
+                        replica_kwargs['dbname'] = replica_kwargs.pop('database')
+                self.replicas.append(ConnectionPool(
+                    1 if pool_min is None else pool_min, pool_max or 1,
+                    health_check_after=pool_health_check,
+                    timeout=pool_timeout,
+                    **replica_kwargs
+                ))
+            self._replica_cycle = itertools.cycle(self.replicas)
 
             # Log a successful database connection
             self.logger.info("Database connection established.")
 
+        except ValueError:
+            raise
         except Exception as e:
             # Log the exception if database connection fails
             self.logger.exception("Failed to connect to the database.")
@@ -48,57 +146,409 @@ class Database:
         :param query: SQL query as a string.
         :return: cleaned SQL query as a string.
         """
-        return re.sub(r'\s+', ' ', query).strip()
+        return clean_query(query)
+
+    def _choose_replica(self):
+        """
+        Choose the replica pool a read is routed to.
+
+        :return: a replica ConnectionPool, or None if the read has to go to the primary.
+        """
+        if not self.replicas or self.in_transaction():
+            return None
+
+        if self.read_your_writes is not None:
+            last_write = getattr(self._local, 'last_write', None)
+            if last_write is not None and time.monotonic() - last_write < self.read_your_writes:
+                return None
+
+        if self.replica_selection == 'least_loaded':
+            return min(self.replicas, key=lambda replica: replica.stats()['in_use'])
+        return next(self._replica_cycle)
+
+    def _mark_write(self):
+        """
+        Remember the time of a write for the read-your-writes window.
+        """
+        if self.read_your_writes is not None:
+            self._local.last_write = time.monotonic()
 
-    def execute(self, query, params=()):
+    @contextmanager
+    def _connection(self, replica=None):
+        """
+        Context manager yielding the connection for one operation.
+        Inside a transaction this is the transaction's connection, otherwise in
+        pooled mode the connection is checked out for the duration of the block.
+
+        :param replica: replica pool to read from, falls back to the primary if it has no usable connection.
+        """
+        transaction_conn = getattr(self._local, 'conn', None)
+        if transaction_conn is not None:
+            yield transaction_conn
+            return
+
+        if replica is not None:
+            try:
+                conn = replica.getconn()
+            except DatabaseError:
+                self.logger.warning("Replica unavailable, reading from the primary.", exc_info=True)
+            else:
+                try:
+                    yield conn
+                finally:
+                    replica.putconn(conn)
+                return
+
+        if self.pool is None:
+            yield self.conn
+            return
+
+        with self.pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def _cursor(self, replica=None):
+        """
+        Context manager yielding a connection and a cursor for one operation.
+
+        :param replica: replica pool to read from, see _connection().
+        """
+        if self.pool is None and replica is None:
+            yield self.conn, self.cursor
+            return
+
+        with self._connection(replica) as conn:
+            with conn.cursor() as cursor:
+                yield conn, cursor
+
+    def in_transaction(self):
+        """
+        Check whether the current thread is inside a transaction() block.
+
+        :return: True if statements are currently batched into a transaction.
+        """
+        return getattr(self._local, 'depth', 0) > 0
+
+    def after_transaction(self, callback):
+        """
+        Run a callback once the current thread's outermost transaction has been
+        committed or rolled back, or right away outside of a transaction.
+
+        :param callback: callable without arguments, registered once per transaction.
+        """
+        if not self.in_transaction():
+            callback()
+            return
+        callbacks = self._local.callbacks
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager grouping statements into a single transaction.
+
+        Statements executed inside the block are not committed one by one; the
+        transaction is committed once when the block exits and rolled back if it
+        raises. Nested blocks use savepoints, so an inner block can fail and be
+        rolled back on its own.
+        """
+        depth = getattr(self._local, 'depth', 0)
+
+        if depth > 0:
+            savepoint = f"pydanql_savepoint_{depth}"
+            with self._cursor() as (conn, cursor):
+                cursor.execute(f"SAVEPOINT {savepoint}")
+            self._local.depth = depth + 1
+            try:
+                yield self
+            except BaseException:
+                with self._cursor() as (conn, cursor):
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                raise
+            else:
+                with self._cursor() as (conn, cursor):
+                    cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+            finally:
+                self._local.depth = depth
+            return
+
+        conn = self.pool.getconn() if self.pool is not None else self.conn
+        self._local.conn = conn
+        self._local.depth = 1
+        self._local.callbacks = []
+        try:
+            # End any transaction left open by earlier reads
+            conn.rollback()
+            yield self
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                self.logger.exception("Failed to roll back transaction.")
+            raise
+        else:
+            try:
+                conn.commit()
+            except Exception as e:
+                self.logger.exception("Failed to commit transaction.")
+                raise DatabaseError("Failed to commit transaction.") from e
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            if self.pool is not None:
+                self.pool.putconn(conn)
+            callbacks, self._local.callbacks = self._local.callbacks, []
+            for callback in callbacks:
+                callback()
+
+    def sync_schema(self):
+        """
+        Create the missing tables and indexes of all tables set up on this database.
+
+        Looks up the existing tables and indexes once and applies only the missing
+        statements, in one transaction and in the order the tables were set up.
+
+        :return: list of the executed statements.
+        """
+        queries = []
+        # Inside the transaction the catalog is read from the primary, not a replica
+        with self.transaction():
+            existing_tables = {row[0].lower() for row in self.fetch(
+                "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema()"
+            )}
+            existing_indexes = {row[0].lower() for row in self.fetch(
+                "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+            )}
+
+            for table in self.tables.values():
+                for query in table._construct_queries_for_sync(existing_tables, existing_indexes):
+                    self.execute(query, table=table.name)
+                    queries.append(query)
+
+        if queries:
+            self.logger.info("Schema synced, %d statements applied.", len(queries))
+        return queries
+
+    def pool_stats(self):
+        """
+        Return connection pool statistics.
+
+        :return: dictionary with pool statistics, or None when pooling is disabled.
+        """
+        return self.pool.stats() if self.pool is not None else None
+
+    def replica_stats(self):
+        """
+        Return connection pool statistics of the read replicas.
+
+        :return: list of dictionaries with pool statistics, one per replica.
+        """
+        return [replica.stats() for replica in self.replicas]
+
+    def execute(self, query, params=(), table=None):
         """
         Execute an SQL query.
 
         :param query: SQL query as a string.
         :param params: parameters for SQL query as a tuple.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :return: number of rows affected.
+        """
+        clean_query = self._clean_query(query)
+        event = self.instrumentation.before(clean_query, params, table, 'execute')
+        try:
+            with self._cursor() as (conn, cursor):
+                cursor.execute(clean_query, params)
+                rowcount = cursor.rowcount
+                if not self.in_transaction():
+                    conn.commit()
+
+        except Exception as e:
+            self.instrumentation.after(event, error=e)
+            # Log the exception if query execution fails
+            self.logger.exception("Failed to execute query.")
+            raise DatabaseError(f"Failed to execute query.") from e
+
+        self._mark_write()
+        self.instrumentation.after(event, rowcount=rowcount)
+        return rowcount
+
+    def execute_many(self, query, params_list, template=None, page_size=100, fetch=False, table=None):
+        """
+        Execute an SQL query for many rows using a multi-row VALUES list.
+
+        :param query: SQL query as a string containing a single VALUES %s placeholder.
+        :param params_list: sequence of parameter tuples, one per row.
+        :param template: optional template for a single row, e.g. '(%s, %s)'.
+        :param page_size: maximum number of rows per statement.
+        :param fetch: whether to return the rows produced by a RETURNING clause.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :return: fetched data as a list of tuples if fetch is set, else None.
         """
         clean_query = self._clean_query(query)
+        event = self.instrumentation.before(clean_query, params_list, table, 'execute_many')
         try:
-            self.cursor.execute(clean_query, params)
-            self.conn.commit()
-            
-            # Log the executed query
-            self.logger.info(f"Executed query: {clean_query} with params: {params}")
+            with self._cursor() as (conn, cursor):
+                result = psycopg2.extras.execute_values(
+                    cursor, clean_query, params_list,
+                    template=template, page_size=page_size, fetch=fetch
+                )
+                if not self.in_transaction():
+                    conn.commit()
 
         except Exception as e:
+            self.instrumentation.after(event, error=e)
             # Log the exception if query execution fails
             self.logger.exception("Failed to execute query.")
             raise DatabaseError(f"Failed to execute query.") from e
 
-    def fetch(self, query, params=()):
+        self._mark_write()
+        self.instrumentation.after(event, rowcount=len(params_list))
+        return result
+
+    def copy_in(self, query, file, table=None):
+        """
+        Load data with COPY ... FROM STDIN.
+
+        :param query: COPY statement reading from STDIN.
+        :param file: file-like object providing the data.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :return: number of rows copied.
+        """
+        clean_query = self._clean_query(query)
+        event = self.instrumentation.before(clean_query, (), table, 'copy_in')
+        try:
+            with self._cursor() as (conn, cursor):
+                cursor.copy_expert(clean_query, file)
+                rowcount = cursor.rowcount
+                if not self.in_transaction():
+                    conn.commit()
+
+        except Exception as e:
+            self.instrumentation.after(event, error=e)
+            # Log the exception if copying fails
+            self.logger.exception("Failed to copy data.")
+            raise DatabaseError(f"Failed to copy data.") from e
+
+        self._mark_write()
+        self.instrumentation.after(event, rowcount=rowcount)
+        return rowcount
+
+    def fetch(self, query, params=(), table=None, primary=False):
         """
         Fetch data from the database using an SQL query.
+        Routed to a read replica if replicas are configured.
 
         :param query: SQL query as a string.
         :param params: parameters for SQL query as a tuple.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :param primary: read from the primary even if replicas are configured.
         :return: fetched data as a list of tuples.
         """
         clean_query = self._clean_query(query)
+        event = self.instrumentation.before(clean_query, params, table, 'fetch')
+        try:
+            with self._cursor(None if primary else self._choose_replica()) as (conn, cursor):
+                cursor.execute(clean_query, params)
+                result = cursor.fetchall()
+
+        except Exception as e:
+            self.instrumentation.after(event, error=e)
+            # Log the exception if fetching fails
+            self.logger.exception("Failed to fetch data.")
+            raise DatabaseError(f"Failed to fetch data.") from e
+
+        self.instrumentation.after(event, rowcount=len(result))
+        return result
+
+    def copy_out(self, query, file, params=(), table=None):
+        """
+        Stream data out with COPY (...) TO STDOUT.
+
+        :param query: COPY statement writing to STDOUT, may contain placeholders.
+        :param file: file-like object the data is written to in chunks.
+        :param params: parameters for the placeholders as a tuple.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :return: number of rows copied.
+        """
+        clean_query = self._clean_query(query)
+        event = self.instrumentation.before(clean_query, params, table, 'copy_out')
+        try:
+            with self._cursor(self._choose_replica()) as (conn, cursor):
+                # COPY takes no bind parameters, so they are merged in client-side
+                cursor.copy_expert(cursor.mogrify(clean_query, params) if params else clean_query, file)
+                rowcount = cursor.rowcount
+
+        except Exception as e:
+            self.instrumentation.after(event, error=e)
+            # Log the exception if copying fails
+            self.logger.exception("Failed to copy data.")
+            raise DatabaseError(f"Failed to copy data.") from e
+
+        self.instrumentation.after(event, rowcount=rowcount)
+        return rowcount
+
+    def stream(self, query, params=(), batch_size=1000, table=None):
+        """
+        Fetch data in batches through a named (server-side) cursor.
+        Only one batch is held in memory at a time. Other statements and
+        transactions may be executed while iterating, also on a single shared
+        connection: there the cursor is declared WITH HOLD and committed, so the
+        server materializes the result.
+
+        :param query: SQL query as a string.
+        :param params: parameters for SQL query as a tuple.
+        :param batch_size: number of rows fetched per round trip.
+        :param table: name of the table the query is issued for, passed to the instrumentation.
+        :return: generator yielding lists of tuples.
+        """
+        clean_query = self._clean_query(query)
+        event = self.instrumentation.before(clean_query, params, table, 'stream')
+        rowcount = 0
         try:
-            self.cursor.execute(clean_query, params)
-            result = self.cursor.fetchall()
+            with self._connection(self._choose_replica()) as conn:
+                # Writes during the iteration commit the shared connection, which would
+                # close a plain named cursor; a WITH HOLD cursor survives the commit
+                withhold = conn is self.conn and not self.in_transaction()
+                with conn.cursor(name=f"pydanql_{uuid4().hex}", withhold=withhold) as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(clean_query, params)
+                    if withhold:
+                        # A WITH HOLD cursor is dropped if its declaring transaction rolls back,
+                        # e.g. when db.transaction() is entered during the iteration
+                        conn.commit()
 
-            # Log the fetching operation
-            self.logger.info(f"Fetched data with query: {clean_query} and params: {params}")
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        rowcount += len(rows)
+                        yield rows
 
-            return result
+                # A named cursor lives inside a transaction, end it
+                if not self.in_transaction():
+                    conn.commit()
 
         except Exception as e:
+            self.instrumentation.after(event, rowcount=rowcount, error=e)
             # Log the exception if fetching fails
             self.logger.exception("Failed to fetch data.")
             raise DatabaseError(f"Failed to fetch data.") from e
 
+        self.instrumentation.after(event, rowcount=rowcount)
+
     def close(self):
         """
         Close the database connection.
         """
         try:
-            self.conn.close()
+            if self.pool is not None:
+                self.pool.closeall()
+            else:
+                self.conn.close()
+            for replica in self.replicas:
+                replica.closeall()
 
             # Log the closing operation
             self.logger.info("Database connection closed.")
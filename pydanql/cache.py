@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Marker for cache misses, so None can be cached
+MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with an optional time to live.
+    Keeps hit, miss, eviction and expiration counters for tuning.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        Initialize LRUCache class.
+
+        :param maxsize: maximum number of entries kept.
+        :param ttl: seconds an entry stays valid, None keeps entries until evicted.
+        """
+        if maxsize <= 0:
+            raise ValueError("Cache size should be 1 or higher")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key, default=MISSING):
+        """
+        Look up an entry and mark it as recently used.
+
+        :param key: hashable cache key.
+        :param default: value returned on a miss.
+        :return: cached value or default.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Store an entry, evicting the least recently used one if the cache is full.
+
+        :param key: hashable cache key.
+        :param value: value to cache.
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drop all entries.
+        """
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        :return: dictionary with size and hit, miss, eviction, expiration and invalidation counters.
+        """
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
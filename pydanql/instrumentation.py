@@ -0,0 +1,192 @@
+import bisect
+import logging
+import threading
+import time
+
+# Upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Histogram key of the statements recorded after max_histograms was reached
+OTHER_STATEMENTS = '(other statements)'
+
+class QueryEvent:
+    """
+    Describes one query passed to the before and after query hooks.
+
+    Attributes:
+    - query: The cleaned SQL with placeholders
+    - params: The query parameters, may contain secrets
+    - table: Name of the table the query was issued for, if known
+    - operation: 'execute', 'execute_many', 'copy_in', 'copy_out', 'fetch' or 'stream'
+    - duration: Seconds the query took, set before the after hooks run
+    - rowcount: Number of rows affected or fetched, if known
+    - error: The exception raised by the query, if any
+    """
+
+    __slots__ = ('query', 'params', 'table', 'operation', 'start', 'duration', 'rowcount', 'error')
+
+    def __init__(self, query, params, table, operation):
+        """
+        Initialize QueryEvent class and start its timer.
+        """
+        self.query = query
+        self.params = params
+        self.table = table
+        self.operation = operation
+        self.start = time.perf_counter()
+        self.duration = None
+        self.rowcount = None
+        self.error = None
+
+
+class Histogram:
+    """
+    Cumulative latency histogram of a single statement.
+    """
+
+    def __init__(self, buckets):
+        """
+        Initialize Histogram class.
+
+        :param buckets: sorted upper bounds in seconds of the buckets.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """
+        Record one latency.
+
+        :param value: latency in seconds.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def export(self):
+        """
+        Export the histogram with cumulative bucket counts.
+
+        :return: dictionary with count, sum, max and buckets.
+        """
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {'count': self.count, 'sum': self.sum, 'max': self.max, 'buckets': buckets}
+
+
+class Instrumentation:
+    """
+    Pluggable query instrumentation for Database.
+
+    Runs registered before and after query hooks, logs queries slower than a
+    threshold and keeps per-statement latency histograms in process.
+    Query text is only formatted for logging when the logger is enabled.
+    """
+
+    def __init__(self, slow_query_threshold=None, buckets=DEFAULT_BUCKETS, logger=None, max_histograms=1000):
+        """
+        Initialize Instrumentation class.
+
+        :param slow_query_threshold: seconds after which a query is logged as a warning, None disables it.
+        :param buckets: upper bounds in seconds of the latency histogram buckets.
+        :param logger: logger used for query and slow query logs.
+        :param max_histograms: maximum number of statements with their own histogram, later
+            statements share the OTHER_STATEMENTS histogram so memory stays bounded.
+        """
+        self.slow_query_threshold = slow_query_threshold
+        self.buckets = tuple(sorted(buckets))
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_histograms = max_histograms
+        self.before_hooks = []
+        self.after_hooks = []
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, before=None, after=None):
+        """
+        Register hooks called with a QueryEvent before and after every query.
+
+        :param before: callable run before the query is sent.
+        :param after: callable run after the query finished or failed.
+        """
+        if before is not None:
+            self.before_hooks.append(before)
+        if after is not None:
+            self.after_hooks.append(after)
+
+    def remove_hook(self, hook):
+        """
+        Unregister a hook previously added with add_hook.
+
+        :param hook: the callable to remove.
+        """
+        for hooks in (self.before_hooks, self.after_hooks):
+            if hook in hooks:
+                hooks.remove(hook)
+
+    def before(self, query, params, table=None, operation='execute'):
+        """
+        Start measuring a query.
+
+        :param query: cleaned SQL query.
+        :param params: query parameters.
+        :param table: name of the table the query was issued for.
+        :param operation: kind of database operation.
+        :return: the QueryEvent to pass to after().
+        """
+        event = QueryEvent(query, params, table, operation)
+        for hook in self.before_hooks:
+            hook(event)
+        return event
+
+    def after(self, event, rowcount=None, error=None):
+        """
+        Finish measuring a query: record its latency, log it and run the after hooks.
+
+        :param event: the QueryEvent returned by before().
+        :param rowcount: number of rows affected or fetched.
+        :param error: the exception raised by the query, if any.
+        """
+        event.duration = time.perf_counter() - event.start
+        event.rowcount = rowcount
+        event.error = error
+
+        with self._lock:
+            histogram = self._histograms.get(event.query)
+            if histogram is None:
+                key = event.query if len(self._histograms) < self.max_histograms else OTHER_STATEMENTS
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(event.duration)
+
+        if self.slow_query_threshold is not None and event.duration >= self.slow_query_threshold:
+            self.logger.warning("Slow query (%.3fs, table %s): %s", event.duration, event.table, event.query)
+        elif self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s on table %s took %.3fs: %s", event.operation, event.table, event.duration, event.query)
+
+        for hook in self.after_hooks:
+            hook(event)
+
+    def histograms(self):
+        """
+        Export the per-statement latency histograms.
+
+        :return: dictionary mapping each statement to its count, sum, max and cumulative bucket counts.
+        """
+        with self._lock:
+            return {query: histogram.export() for query, histogram in self._histograms.items()}
+
+    def reset(self):
+        """
+        Drop all recorded histograms.
+        """
+        with self._lock:
+            self._histograms.clear()
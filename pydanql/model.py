@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Optional
 from datetime import datetime
 from uuid import uuid4
@@ -25,3 +25,40 @@ class ObjectBaseModel(BaseModel):
     # A unique identifier (UUID) for the object, converted to a hexadecimal string.
     # It is Optional, and by default, a unique hex string will be generated.
     slug: Optional[str] = Field(default_factory=lambda: uuid4().hex, constraints=["UNIQUE", "NULL"])
+
+    # Names of the fields assigned since the object was loaded or last written.
+    _changed_fields: set = PrivateAttr(default_factory=set)
+
+    # Related objects loaded with find_many(prefetch=[...]), keyed by relation name.
+    _related: dict = PrivateAttr(default_factory=dict)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Track assigned fields so updates only write what changed
+        if name in type(self).model_fields:
+            self._changed_fields.add(name)
+
+    @property
+    def changed_fields(self):
+        """Names of the fields assigned since the object was loaded or last written."""
+        return set(self._changed_fields)
+
+    @property
+    def related(self):
+        """Related objects loaded with find_many(prefetch=[...]), keyed by relation name."""
+        return self._related
+
+    def mark_clean(self):
+        """Forget all tracked changes, e.g. after they have been written."""
+        self._changed_fields.clear()
+
+
+class PartialModel:
+    """
+    Marks the partial models returned by find_many(fields=[...]).
+
+    A partial model is a subclass of the table's model that only holds the selected
+    columns: reading any other field raises AttributeError instead of returning a
+    made-up default. It can be written back with update(), but add() and replace()
+    refuse it since its other columns are unknown.
+    """
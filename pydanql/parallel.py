@@ -0,0 +1,64 @@
+from .base import Database
+
+# Table of the current worker process, set up once by init_worker
+_worker_table = None
+# Error raised while setting up the worker, reported by map_range
+_worker_error = None
+
+def split_range(low, high, parts):
+    """
+    Split the closed range [low, high] into consecutive ranges.
+
+    :param low: smallest key, an int, float, Decimal or datetime.
+    :param high: largest key.
+    :param parts: number of ranges wanted, fewer are returned for small integer ranges.
+    :return: list of (start, end, last) tuples; ranges exclude their end, except the last one.
+    """
+    if low == high:
+        return [(low, high, True)]
+
+    if isinstance(low, int) and isinstance(high, int):
+        parts = max(1, min(parts, high - low + 1))
+        bounds = [low + (high - low + 1) * index // parts for index in range(parts)]
+    else:
+        bounds = [low + (high - low) * index / parts for index in range(parts)]
+    bounds.append(high)
+
+    return [(bounds[index], bounds[index + 1], index == parts - 1) for index in range(parts)]
+
+def init_worker(connect_kwargs, model, table_name, trusted):
+    """
+    Open the connection of a worker process, see Table.parallel_map.
+
+    :param connect_kwargs: connection arguments of the parent's Database.
+    :param model: the model class of the table.
+    :param table_name: name of the table.
+    :param trusted: whether the table builds models without validation.
+    """
+    global _worker_table, _worker_error
+    from .table import Table
+
+    try:
+        # The parent owns the schema, workers never issue DDL
+        db = Database(schema_sync='off', **connect_kwargs)
+        _worker_table = Table(db, model, table_name=table_name, trusted=trusted)
+    except Exception as e:
+        # A failing initializer makes multiprocessing restart the worker forever
+        _worker_error = e
+
+def map_range(task):
+    """
+    Stream one key range in a worker process and apply the function to every model.
+
+    :param task: tuple of function, query, query values and batch size.
+    :return: list of the function results in key order.
+    """
+    if _worker_error is not None:
+        raise _worker_error
+
+    fn, query, values, batch_size = task
+    table = _worker_table
+    results = []
+    for rows in table.db.stream(query, values, batch_size=batch_size, table=table.name):
+        results.extend(fn(object) for object in table._hydrate(rows))
+    return results
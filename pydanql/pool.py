@@ -0,0 +1,163 @@
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+import threading
+import time
+from contextlib import contextmanager
+from .errors import DatabaseError
+
+class ConnectionPool:
+    """
+    Thread-safe pool of PostgreSQL connections.
+    Blocks while all connections are checked out, health-checks idle connections
+    before handing them out and keeps usage statistics.
+    """
+
+    def __init__(self, minconn, maxconn, health_check_after=30, timeout=None, **kwargs):
+        """
+        Initialize ConnectionPool class.
+
+        :param minconn: number of connections opened up front.
+        :param maxconn: maximum number of connections checked out at the same time.
+        :param health_check_after: seconds a connection may sit idle before it is pinged on checkout.
+        :param timeout: default seconds to wait for a free connection, None waits forever.
+        :param kwargs: connection arguments passed to psycopg2.connect.
+        """
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Pool sizes must satisfy 0 <= pool_min <= pool_max and pool_max >= 1")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+
+        self._pool = psycopg2.pool.ThreadedConnectionPool(minconn, maxconn, **kwargs)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._idle_since = {}
+
+        self._checkouts = 0
+        self._in_use = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._discarded = 0
+
+    def _is_healthy(self, conn):
+        """
+        Check whether a connection can still be used.
+
+        :param conn: psycopg2 connection taken from the pool.
+        :return: True if the connection is usable.
+        """
+        if conn.closed:
+            return False
+
+        idle_since = self._idle_since.get(id(conn))
+        if idle_since is None or time.monotonic() - idle_since < self.health_check_after:
+            return True
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self, timeout=None):
+        """
+        Check out a connection, waiting until one is free.
+
+        :param timeout: seconds to wait for a free connection, defaults to the pool timeout.
+        :return: psycopg2 connection.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=timeout):
+            raise DatabaseError("Timed out waiting for a database connection.")
+        waited = time.monotonic() - start
+
+        try:
+            conn = self._pool.getconn()
+            if not self._is_healthy(conn):
+                with self._lock:
+                    self._idle_since.pop(id(conn), None)
+                    self._discarded += 1
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+        except Exception as e:
+            self._slots.release()
+            raise DatabaseError("Failed to check out a database connection.") from e
+
+        with self._lock:
+            self._idle_since.pop(id(conn), None)
+            self._checkouts += 1
+            self._in_use += 1
+            self._wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+
+        return conn
+
+    def putconn(self, conn, close=False):
+        """
+        Return a connection to the pool.
+
+        :param conn: psycopg2 connection previously checked out.
+        :param close: whether to close the connection instead of keeping it.
+        """
+        try:
+            if conn.closed:
+                close = True
+            elif conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                # Never hand out a connection with a transaction left open
+                conn.rollback()
+        except Exception:
+            close = True
+
+        try:
+            self._pool.putconn(conn, close=close)
+        finally:
+            with self._lock:
+                if not close:
+                    self._idle_since[id(conn)] = time.monotonic()
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Context manager that checks out a connection and returns it afterwards.
+
+        :param timeout: seconds to wait for a free connection.
+        """
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def stats(self):
+        """
+        Return pool usage statistics.
+
+        :return: dictionary with sizes, in-use count, checkouts and wait times.
+        """
+        with self._lock:
+            return {
+                'min': self.minconn,
+                'max': self.maxconn,
+                'in_use': self._in_use,
+                'checkouts': self._checkouts,
+                'wait_time': self._wait_time,
+                'max_wait_time': self._max_wait_time,
+                'avg_wait_time': self._wait_time / self._checkouts if self._checkouts else 0.0,
+                'discarded': self._discarded,
+            }
+
+    def closeall(self):
+        """
+        Close all connections of the pool.
+        """
+        self._pool.closeall()
+        with self._lock:
+            self._idle_since.clear()
@@ -1,14 +1,45 @@
 from pydantic import ValidationError
 from uuid import uuid4
-from datetime import datetime
-from pydantic import BaseModel
+from datetime import date, datetime, timedelta
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_jsonable_python
+from psycopg2.extras import Json
 from http import HTTPStatus
-from typing import Type, Optional, Tuple, List
+from typing import Type, Optional, Tuple, List, Union, get_args, get_origin
+import array
+import io
 import json
-import inflect
+import multiprocessing
+import os
+import time
+import types
+import base64
+import hashlib
+from .base import clean_query
+from .cache import LRUCache, MISSING
+from .model import PartialModel
+
+# The inflect engine is slow to build, so it is only created once a name needs pluralizing
+_inflect_engine = None
+
+def pluralize(name):
+    """
+    Returns the plural of a model name, e.g. 'Books' for 'Book'.
+
+    Parameters:
+    - name: The singular name
+
+    Returns:
+    - The plural name
+    """
+    global _inflect_engine
+    if _inflect_engine is None:
+        import inflect
+        _inflect_engine = inflect.engine()
+    return _inflect_engine.plural(name)
 
-# Initialize the inflect engine
-p = inflect.engine()
+# Optional[int] is a typing.Union, int | None a types.UnionType on Python 3.10+
+UNION_TYPES = (Union, getattr(types, 'UnionType', Union))
 
 def get_all_annotations(cls):
     """
@@ -25,17 +56,63 @@ def get_all_annotations(cls):
         annotations.update(getattr(base, '__annotations__', {}))
     return annotations
 
-def convert_to_pg_array(py_tuple):
-    return '{' + ','.join(map(str, py_tuple)) + '}'
+def unwrap_optional(annotation):
+    """
+    Returns the wrapped type of an Optional annotation, or the annotation itself.
+
+    Parameters:
+    - annotation: The type annotation to unwrap
+
+    Returns:
+    - The annotation without its None option
+    """
+    origin = get_origin(annotation)
+    if origin in UNION_TYPES:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
 
 def convert_to_pg_array(py_tuple):
-    return '{' + ','.join(map(str, py_tuple)) + '}'
+    """Format a sequence as a PostgreSQL array literal, quoting every element."""
+    elements = []
+    for element in py_tuple:
+        if element is None:
+            elements.append('NULL')
+        else:
+            elements.append('"' + str(element).replace('\\', '\\\\').replace('"', '\\"') + '"')
+    return '{' + ','.join(elements) + '}'
 
 def convert_to_pg_datetime(py_datetime):
     return py_datetime.isoformat()
 
 def convert_to_pg_json(py_dict):
-    return json.dumps(py_dict)
+    """Serialize a value to JSON, including nested models, datetimes and other pydantic types."""
+    return json.dumps(py_dict, default=to_jsonable_python)
+
+def convert_to_pg_copy_field(value):
+    """Format a converted value as a field of COPY ... WITH (FORMAT csv, NULL '\\N') input."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, Json):
+        value = value.dumps(value.adapted)
+    elif isinstance(value, list):
+        value = convert_to_pg_array(value)
+    elif isinstance(value, bool):
+        return 't' if value else 'f'
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\x' + bytes(value).hex()
+    return '"' + str(value).replace('"', '""') + '"'
+
+def convert_to_pg_value(value):
+    """Convert a field value stored in a TEXT column into a string, see Table._build_encoders."""
+    if isinstance(value, tuple):
+        return convert_to_pg_array(value)
+    elif isinstance(value, datetime):
+        return convert_to_pg_datetime(value)
+    elif isinstance(value, dict):
+        return convert_to_pg_json(value)
+    return value
 
 
 class Table:
@@ -53,9 +130,46 @@ class Table:
         bytes: "BYTEA",
         bytearray: "BYTEA",
         memoryview: "BYTEA",
+        datetime: "TIMESTAMPTZ",
+        date: "DATE",
+        dict: "JSONB",
+    }
+
+    # Wraps values written to JSON columns so the driver sends them as JSON
+    JSON_ADAPTER = Json
+
+    # Maximum number of compiled queries kept per table
+    QUERY_CACHE_SIZE = 512
+
+    # Maps SQL column types to array.array typecodes used by to_columns
+    ARRAY_TYPECODES = {
+        "INTEGER": "q",
+        "SMALLINT": "q",
+        "BIGINT": "q",
+        "SERIAL": "q",
+        "BIGSERIAL": "q",
+        "REAL": "d",
+        "DOUBLE PRECISION": "d",
+        "BOOLEAN": "b",
     }
 
-    def __init__(self, db, model, table_name=None):
+    # Index methods accepted by Field(index=...) and the model's 'indexes' config
+    INDEX_METHODS = ('btree', 'hash', 'gin', 'gist', 'brin', 'trgm')
+
+    # Result formats accepted by the as_ argument of the find methods
+    RESULT_FORMATS = ('models', 'dicts', 'tuples')
+
+    # Partition intervals accepted by the model's 'partition' config
+    PARTITION_INTERVALS = ('day', 'month')
+
+    # PostgreSQL truncates longer identifiers
+    MAX_IDENTIFIER_LENGTH = 63
+
+    # Seconds after a cache clear during which the cache is filled from the primary, not a
+    # lagging replica, unless the database sets read_your_writes
+    CACHE_PRIMARY_WINDOW = 5.0
+
+    def __init__(self, db, model, table_name=None, trusted=False, cache_size=None, cache_ttl=None):
         """
         Initialize the Table class.
 
@@ -63,54 +177,543 @@ class Table:
         - db: Database connection
         - model: Pydantic model describing the table schema
         - table_name: Optional custom name for the table
+        - trusted: Build models from fetched rows without re-validating them
+        - cache_size: Enables a read cache for find_many, find_one and count with this many entries
+        - cache_ttl: Optional seconds a cached read stays valid
         """
         self.db = db
         self.model = model
-        self.name = table_name or p.plural(self.model.__name__)
+        self.name = table_name or pluralize(self.model.__name__)
+        self.partition = self._generate_partition_from_model()
+        # Unique constraints of a partitioned table have to include the partition key
+        self.primary_key = ('id', self.partition['by']) if self.partition else ('id',)
         self.schema = self._generate_schema_from_model()
         self.columns = self._generate_columns_from_model()
-        self._create_table()
+        self.trusted = trusted
+        # Rows come from our own typed table, so validation can be skipped if trusted
+        self._model_constructor = self.model.model_construct if trusted else self.model
+        # Subclass of the model for projections, created on the first find_many(fields=[...])
+        self._partial_model = None
+        # Per column conversions between model values and driver values, built once
+        self._encoders = self._build_encoders()
+        self._decoders = self._build_decoders()
+        self._query_cache = {}
+        self._query_cache_hits = 0
+        self._query_cache_misses = 0
+        # Writes through this Table clear the read cache; writes from elsewhere are bounded by cache_ttl
+        self.cache = LRUCache(cache_size, cache_ttl) if cache_size else None
+        self._cache_cleared_at = None
+        self.relations = self._generate_relations_from_model()
+        self.indexes = self._generate_indexes_from_model()
+        # Database(schema_sync='deferred') leaves the DDL to db.sync_schema(), 'off' skips it entirely
+        if getattr(db, 'schema_sync', 'eager') not in ('deferred', 'off'):
+            self._create_table()
+        # Register the table so other tables can resolve relationships to this model
+        tables = getattr(db, 'tables', None)
+        if isinstance(tables, dict):
+            tables[self.model] = self
 
     def _generate_columns_from_model(self) -> str:
         """Generate column names from the model."""
         field_names = []
         all_annotations = get_all_annotations(self.model)
         for name in all_annotations.keys():
-            field_names.append(name)
+            # Skip private attributes and class variables
+            if name in self.model.model_fields:
+                field_names.append(name)
         return field_names
 
     def _generate_schema_from_model(self) -> str:
         """Generate the schema from the model's annotations."""
         columns = []
+        table_constraints = []
         all_annotations = get_all_annotations(self.model)
         for name, column in all_annotations.items():
-            # Handle Optional, List, etc.
-            field_type = column.__origin__ if hasattr(column, '__origin__') else column
-            # Default to TEXT type if not found in TYPE_MAPPING
-            # TODO: This should be merged with the next step and throw  an error if it can't be mapped.
-            column_type = self.TYPE_MAPPING.get(field_type, "TEXT")
+            # Skip private attributes and class variables
+            if name not in self.model.model_fields:
+                continue
+            column_type = self._column_sql_type(name)
 
             constraints = []
-            # Get constraints and data type if defined on pydantic Field
+            # Get constraints if defined on pydantic Field
             pydantic_field = self.model.__fields__[name]
-            if pydantic_field.json_schema_extra:
-                constraints.extend(pydantic_field.json_schema_extra.get('constraints', []))
-                if pydantic_field.json_schema_extra.get('data_type'):
-                    column_type = pydantic_field.json_schema_extra.get('data_type')
+            extra = pydantic_field.json_schema_extra or {}
+            if 'constraints' in extra or 'data_type' in extra:
+                constraints.extend(extra.get('constraints', []))
             elif 'Optional' in str(column):
                 constraints.append('NULL')
             else:
                 constraints.append('NOT NULL')
 
+            if extra.get('references'):
+                constraints.append(self._construct_references_clause(extra))
+
+            if self.partition:
+                # Move primary key and unique constraints to the table, together with the partition key
+                for constraint in [c for c in constraints if c.upper() in ('PRIMARY KEY', 'UNIQUE')]:
+                    constraints.remove(constraint)
+                    if constraint.upper() == 'UNIQUE' and name != self.partition['by']:
+                        table_constraints.append(f"UNIQUE ({name}, {self.partition['by']})")
+
             columns.append(f"{name} {column_type} {' '.join(constraints)}")
 
+        if self.partition:
+            columns.append(f"PRIMARY KEY ({', '.join(self.primary_key)})")
+            columns.extend(table_constraints)
+
         return ", ".join(columns)
 
+    def _column_sql_type(self, name):
+        """
+        Determine the SQL type of a column.
+
+        Parameters:
+        - name: The column name
+
+        Returns:
+        - The data_type given on the pydantic Field, else the TYPE_MAPPING type
+        """
+        extra = self.model.__fields__[name].json_schema_extra or {}
+        if extra.get('data_type'):
+            return extra.get('data_type')
+
+        field_type = unwrap_optional(get_all_annotations(self.model)[name])
+        # Handle Tuple, List, Dict, etc.
+        origin = get_origin(field_type) or field_type
+
+        if origin in (tuple, list):
+            elements = [unwrap_optional(arg) for arg in get_args(field_type) if arg is not Ellipsis]
+            # Only scalar elements fit a typed array, models, dicts and nested sequences are stored as JSON
+            if any(get_origin(element) or not self._is_scalar_type(element) for element in elements):
+                return "JSONB"
+            element_types = {self.TYPE_MAPPING.get(element, "TEXT") for element in elements}
+            # Mixed element types are stored as text
+            element_type = element_types.pop() if len(element_types) == 1 else "TEXT"
+            return f"{element_type}[]"
+        if isinstance(origin, type) and issubclass(origin, BaseModel):
+            return "JSONB"
+
+        # Default to TEXT type if not found in TYPE_MAPPING
+        # TODO: This should throw an error if it can't be mapped.
+        return self.TYPE_MAPPING.get(origin, "TEXT")
+
+    def _is_scalar_type(self, element):
+        """Whether a sequence element type can be stored in a typed array, unlike models and dicts."""
+        if not isinstance(element, type):
+            return False
+        return not issubclass(element, (BaseModel, dict, list, tuple))
+
+    def _generate_partition_from_model(self):
+        """
+        Read the range partitioning declaration of the model, e.g.
+        model_config = ConfigDict(json_schema_extra={'partition': {
+            'by': 'date_created', 'interval': 'month', 'premake': 3, 'retention': 12,
+        }})
+
+        'premake' is the number of future partitions created ahead, 'retention' the
+        number of past partitions kept by maintain_partitions, None keeps all.
+
+        Returns:
+        - Dictionary with by, interval, premake and retention, or None if the table is not partitioned
+        """
+        config_extra = self.model.model_config.get('json_schema_extra') or {}
+        partition = config_extra.get('partition') if isinstance(config_extra, dict) else None
+        if not partition:
+            return None
+
+        partition = dict({'by': 'date_created', 'interval': 'month', 'premake': 3, 'retention': None}, **partition)
+        if partition['interval'] not in self.PARTITION_INTERVALS:
+            raise ValueError(f"Invalid partition interval: {partition['interval']}, use one of day, month")
+        if partition['by'] not in self.model.model_fields:
+            raise ValueError(f"Invalid partition column: {partition['by']}")
+        return partition
+
+    def _partition_start(self, moment):
+        """
+        Return the start of the partition holding a point in time.
+
+        Parameters:
+        - moment: A datetime or date
+
+        Returns:
+        - The first day of the day or month as a datetime
+        """
+        if self.partition['interval'] == 'day':
+            return datetime(moment.year, moment.month, moment.day)
+        return datetime(moment.year, moment.month, 1)
+
+    def _partition_shift(self, start, steps):
+        """
+        Move a partition start by a number of partitions.
+
+        Parameters:
+        - start: A partition start as returned by _partition_start
+        - steps: Number of partitions, negative to move back
+
+        Returns:
+        - The start of the other partition
+        """
+        if self.partition['interval'] == 'day':
+            return start + timedelta(days=steps)
+        month = start.month - 1 + steps
+        return datetime(start.year + month // 12, month % 12 + 1, 1)
+
+    def _partition_name(self, start):
+        """Return the name of the child table starting at the given partition start."""
+        suffix = start.strftime('%Y%m%d' if self.partition['interval'] == 'day' else '%Y%m')
+        return f"{self.name}_p{suffix}".lower()
+
+    def _construct_query_for_partition(self, start):
+        """
+        Construct an idempotent statement creating one child partition.
+
+        Parameters:
+        - start: The partition start
+
+        Returns:
+        - The constructed query
+        """
+        end = self._partition_shift(start, 1)
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self._partition_name(start)} PARTITION OF {self.name} "
+            f"FOR VALUES FROM ('{start.date().isoformat()}') TO ('{end.date().isoformat()}')"
+        )
+
+    def _construct_queries_for_partitions(self, now=None, existing_tables=()):
+        """
+        Construct the statements creating the current partition and 'premake' partitions ahead.
+
+        There is no DEFAULT partition: PostgreSQL refuses to create a partition while the
+        default one holds rows in its range, and retention could never drop those rows.
+        Inserts outside the created ranges fail instead.
+
+        Parameters:
+        - now: The current time, defaults to datetime.now()
+        - existing_tables: Lowercase names of tables to skip because they exist
+
+        Returns:
+        - List of queries, all safe to run repeatedly
+        """
+        queries = []
+        start = self._partition_start(now or datetime.now())
+        for step in range(self.partition['premake'] + 1):
+            partition_start = self._partition_shift(start, step)
+            if self._partition_name(partition_start) not in existing_tables:
+                queries.append(self._construct_query_for_partition(partition_start))
+        return queries
+
+    def maintain_partitions(self, now=None, retention=None):
+        """
+        Create upcoming partitions and drop the partitions past the retention.
+        Run it regularly, e.g. daily, so inserts always find their partition: rows
+        outside the created ranges are rejected by PostgreSQL.
+
+        Parameters:
+        - now: The current time, defaults to datetime.now()
+        - retention: Number of past partitions to keep, defaults to the model's 'retention'
+
+        Returns:
+        - List of the names of the dropped partitions
+        """
+        if not self.partition:
+            raise ValueError(f"Table {self.name} is not partitioned")
+
+        now = now or datetime.now()
+        retention = self.partition['retention'] if retention is None else retention
+
+        with self.db.transaction():
+            for query in self._construct_queries_for_partitions(now):
+                self.db.execute(query, table=self.name)
+
+            dropped = []
+            if retention is not None:
+                cutoff = self._partition_shift(self._partition_start(now), -retention)
+                for name, start in self._list_partitions():
+                    # Drop whole partitions that end before the oldest kept one starts
+                    if self._partition_shift(start, 1) <= cutoff:
+                        self.db.execute(f"DROP TABLE IF EXISTS {name}", table=self.name)
+                        dropped.append(name)
+
+        if dropped:
+            self._invalidate_cache()
+        return dropped
+
+    def _list_partitions(self):
+        """
+        List the child partitions created by this table.
+
+        Returns:
+        - List of (name, partition start) tuples, oldest first
+        """
+        query = """
+            SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+        """
+        prefix = f"{self.name}_p".lower()
+        format = '%Y%m%d' if self.partition['interval'] == 'day' else '%Y%m'
+
+        partitions = []
+        for (name,) in self.db.fetch(query, (self.name,), table=self.name):
+            if not name.startswith(prefix):
+                continue
+            try:
+                partitions.append((name, datetime.strptime(name[len(prefix):], format)))
+            except ValueError:
+                # Not one of ours, e.g. attached by hand
+                continue
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    def _generate_relations_from_model(self):
+        """
+        Collect the relationships of the model.
+
+        A relationship is a foreign key column declared with
+        Field(references='Customers', relation='customer', on_delete='CASCADE').
+        The relation name defaults to the column name without its '_id' suffix.
+        References are table names, not model classes: the extra ends up in the
+        model's JSON schema, which must stay serializable.
+
+        Returns:
+        - Dictionary mapping relation names to (column, referenced table name)
+        """
+        relations = {}
+        for name in self.model.model_fields:
+            extra = self.model.__fields__[name].json_schema_extra or {}
+            if extra.get('references'):
+                if not isinstance(extra['references'], str):
+                    raise ValueError(f"Invalid reference of {name}: use the referenced table name, e.g. references='Customers'")
+                relation = extra.get('relation') or (name[:-3] if name.endswith('_id') else name)
+                relations[relation] = (name, extra['references'])
+        return relations
+
+    def _construct_references_clause(self, extra):
+        """
+        Constructs the REFERENCES constraint of a foreign key column.
+
+        Parameters:
+        - extra: The json_schema_extra of the pydantic Field
+
+        Returns:
+        - SQL REFERENCES constraint
+        """
+        clause = f"REFERENCES {extra['references']} (id)"
+        if extra.get('on_delete'):
+            clause += f" ON DELETE {extra['on_delete']}"
+        return clause
+
+    def _column_python_type(self, name):
+        """
+        Determine the Python type of a column, e.g. tuple for Optional[Tuple[int, ...]].
+
+        Parameters:
+        - name: The column name
+
+        Returns:
+        - The unwrapped annotation without its type arguments
+        """
+        field_type = unwrap_optional(get_all_annotations(self.model)[name])
+        return get_origin(field_type) or field_type
+
+    def _build_encoders(self):
+        """
+        Build the conversions applied to model values before they are written.
+
+        Arrays are sent as lists and JSON values wrapped in JSON_ADAPTER, so the
+        driver passes typed data. Datetimes and the base types need no conversion.
+        Tuples, lists and dicts in columns declared as TEXT keep their string form.
+
+        Returns:
+        - Dictionary mapping column names to a conversion callable
+        """
+        encoders = {}
+        for name in self.columns:
+            column_type = self._column_sql_type(name).upper()
+            if column_type.startswith("TEXT") and column_type.endswith("[]"):
+                encoders[name] = lambda value: [None if element is None else str(element) for element in value]
+            elif column_type.endswith("[]"):
+                encoders[name] = list
+            elif column_type in ("JSON", "JSONB"):
+                adapter = self.JSON_ADAPTER
+                encoders[name] = lambda value: adapter(value, dumps=convert_to_pg_json)
+            elif self._column_python_type(name) in (tuple, list, dict):
+                encoders[name] = convert_to_pg_value
+        return encoders
+
+    def _build_decoders(self):
+        """
+        Build the conversions applied to fetched values before models are constructed
+        without validation. Arrays come back as lists and JSON as dicts.
+
+        Returns:
+        - Dictionary mapping column names to a conversion callable
+        """
+        decoders = {}
+        for name in self.columns:
+            origin = self._column_python_type(name)
+            if origin in (tuple, list) and self._column_sql_type(name).upper() in ("JSON", "JSONB"):
+                # Sequences of models or dicts come back as JSON lists
+                decoders[name] = TypeAdapter(unwrap_optional(get_all_annotations(self.model)[name])).validate_python
+            elif origin is tuple:
+                decoders[name] = tuple
+            elif isinstance(origin, type) and issubclass(origin, BaseModel):
+                decoders[name] = origin.model_validate
+        return decoders
+
+    def _generate_indexes_from_model(self):
+        """
+        Collect the index declarations of the model.
+
+        Single column indexes are declared with Field(index=True | 'btree' | 'gin' | 'trgm' | ...).
+        Composite and partial indexes are declared in the model config, e.g.
+        model_config = ConfigDict(json_schema_extra={'indexes': [
+            {'columns': ['author', 'year'], 'where': 'year > 2000', 'unique': False, 'method': 'btree'},
+        ]})
+
+        Returns:
+        - List of dictionaries with columns, method, where and unique
+        """
+        indexes = []
+        for name in self.columns:
+            extra = self.model.__fields__[name].json_schema_extra or {}
+            index = extra.get('index')
+            if index:
+                indexes.append({'columns': [name], 'method': 'btree' if index is True else index})
+
+        config_extra = self.model.model_config.get('json_schema_extra') or {}
+        for index in config_extra.get('indexes', []) if isinstance(config_extra, dict) else []:
+            if isinstance(index, dict):
+                indexes.append(dict(index))
+            else:
+                # A plain sequence of column names
+                indexes.append({'columns': list(index)})
+
+        for index in indexes:
+            index.setdefault('method', 'btree')
+            if index['method'] not in self.INDEX_METHODS:
+                raise ValueError(f"Invalid index method: {index['method']}")
+            for column in index['columns']:
+                if column not in self.columns:
+                    raise ValueError(f"Invalid index column: {column}")
+
+        # CREATE INDEX IF NOT EXISTS would silently skip an index sharing the name of another
+        names = set()
+        for index in indexes:
+            name = self._index_name(index)
+            if len(name) > self.MAX_IDENTIFIER_LENGTH:
+                raise ValueError(f"Index name longer than {self.MAX_IDENTIFIER_LENGTH} characters: {name}")
+            if name in names:
+                raise ValueError(f"Duplicate index name: {name}")
+            names.add(name)
+
+        return indexes
+
+    def _index_name(self, index):
+        """
+        Determine the name of an index.
+
+        Parameters:
+        - index: Index declaration as returned by _generate_indexes_from_model
+
+        Returns:
+        - The given name, else one derived from the table, columns, method and a hash of
+          'where' and 'unique', shortened with a hash to fit PostgreSQL's identifier length
+        """
+        if index.get('name'):
+            return index['name'].lower()
+
+        def digest(text):
+            return hashlib.sha1(text.encode()).hexdigest()[:8]
+
+        name = f"{self.name}_{'_'.join(index['columns'])}_{index['method']}".lower()
+        if index.get('where') or index.get('unique'):
+            # Partial and unique indexes on the same columns need names of their own
+            name += f"_{digest(repr((index.get('where') or '', bool(index.get('unique')))))}"
+        name += "_idx"
+        if len(name) > self.MAX_IDENTIFIER_LENGTH:
+            name = f"{name[:self.MAX_IDENTIFIER_LENGTH - 9]}_{digest(name)}"
+        return name
+
+    def _construct_query_for_index(self, index):
+        """
+        Construct an idempotent CREATE INDEX statement.
+
+        Parameters:
+        - index: Index declaration as returned by _generate_indexes_from_model
+
+        Returns:
+        - The constructed query
+        """
+        columns = index['columns']
+        method = index['method']
+        name = self._index_name(index)
+
+        if method == 'trgm':
+            # Trigram indexes speed up LIKE filters and need the pg_trgm extension
+            using = "gin"
+            columns_str = ', '.join(f"{column} gin_trgm_ops" for column in columns)
+        else:
+            using = method
+            columns_str = ', '.join(columns)
+
+        unique = "UNIQUE " if index.get('unique') else ""
+        where = f"WHERE {index['where']}" if index.get('where') else ""
+        return f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {self.name} USING {using} ({columns_str}) {where}".strip()
+
+    def _construct_queries_for_create_table(self):
+        """
+        Construct the statements creating the table and its indexes.
+
+        Returns:
+        - List of queries, all safe to run repeatedly
+        """
+        queries = [self._construct_query_for_create_table()]
+        if self.partition:
+            queries.extend(self._construct_queries_for_partitions())
+
+        if any(index['method'] == 'trgm' for index in self.indexes):
+            queries.append("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        queries.extend(self._construct_query_for_index(index) for index in self.indexes)
+
+        return queries
+
+    def _construct_query_for_create_table(self):
+        """
+        Construct the CREATE TABLE statement, partitioned by range if the model declares it.
+
+        Returns:
+        - The constructed query
+        """
+        partition_clause = f" PARTITION BY RANGE ({self.partition['by']})" if self.partition else ""
+        return f"CREATE TABLE IF NOT EXISTS {self.name} ({self.schema}){partition_clause};"
+
+    def _construct_queries_for_sync(self, existing_tables, existing_indexes):
+        """
+        Construct the statements creating only the parts of the schema that are missing.
+
+        Parameters:
+        - existing_tables: Set of lowercase names of the tables in the database
+        - existing_indexes: Set of lowercase names of the indexes in the database
+
+        Returns:
+        - List of queries, empty if the table and all its indexes exist
+        """
+        queries = []
+        if self.name.lower() not in existing_tables:
+            queries.append(self._construct_query_for_create_table())
+        if self.partition:
+            queries.extend(self._construct_queries_for_partitions(existing_tables=existing_tables))
+
+        missing = [index for index in self.indexes if self._index_name(index).lower() not in existing_indexes]
+        if any(index['method'] == 'trgm' for index in missing):
+            queries.append("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        queries.extend(self._construct_query_for_index(index) for index in missing)
+
+        return queries
+
     def _create_table(self):
-        """Create the table if it doesn't exist."""
-        schema = self._generate_schema_from_model()
-        query = f"CREATE TABLE IF NOT EXISTS {self.name} ({schema});"
-        self.db.execute(query)
+        """Create the table and its indexes if they don't exist."""
+        for query in self._construct_queries_for_create_table():
+            self.db.execute(query, table=self.name)
 
     def _construct_query_for_insert_or_replace(self, object: BaseModel, replace=False):
         """
@@ -124,42 +727,201 @@ class Table:
         - The constructed query and data
         """
         columns = self.columns.copy()
+        if not replace and getattr(object, "id", None) is None:
+            columns.remove('id')
 
-        # Handle the 'replace' case
-        if replace:
+        def build():
             columns_str = ', '.join(columns)
             placeholders = ', '.join(['%s'] * len(columns))
 
-            updates = ', '.join([f"{field} = EXCLUDED.{field}" for field in columns])
-            query = f"""
-                INSERT INTO {self.name} ({columns_str}) VALUES ({placeholders})
-                ON CONFLICT (id) DO UPDATE SET {updates}
-            """
-        # Handle the 'insert' case
-        else:
-            if getattr(object, "id", None) is None:
-                columns.remove('id')
-
-            columns_str = ', '.join(columns)
-            placeholders = ', '.join(['%s'] * len(columns))
-            query = f"INSERT INTO {self.name} ({columns_str}) VALUES ({placeholders})"
+            # Handle the 'replace' case
+            if replace:
+                return f"""
+                    INSERT INTO {self.name} ({columns_str}) VALUES ({placeholders})
+                    {self._construct_conflict_clause(columns)}
+                """
+            # Handle the 'insert' case
+            return f"INSERT INTO {self.name} ({columns_str}) VALUES ({placeholders})"
 
+        query = self._compiled_query(('insert_or_replace', replace, len(columns)), build)
 
         # Now convert data if needet
-        #data = [getattr(object, field) for field in columns]
-        data = []
+        data = self._construct_row(object, columns)
+        return query, data
+
+    def _construct_conflict_clause(self, columns):
+        """
+        Constructs the ON CONFLICT clause turning an INSERT into an upsert.
+
+        Parameters:
+        - columns: The inserted columns, all of them are updated on conflict
+
+        Returns:
+        - SQL ON CONFLICT clause
+        """
+        updates = ', '.join([f"{field} = EXCLUDED.{field}" for field in columns])
+        return f"ON CONFLICT ({', '.join(self.primary_key)}) DO UPDATE SET {updates}"
+
+    def _compiled_query(self, key, build):
+        """
+        Return the cleaned SQL for a query shape, building it only on a cache miss.
+
+        Parameters:
+        - key: Hashable description of the query shape
+        - build: Callable returning the SQL string for the shape
+
+        Returns:
+        - The cleaned query
+        """
+        query = self._query_cache.get(key)
+        if query is not None:
+            self._query_cache_hits += 1
+            return query
+
+        self._query_cache_misses += 1
+        query = clean_query(build())
+        if len(self._query_cache) >= self.QUERY_CACHE_SIZE:
+            # Drop the oldest entry
+            self._query_cache.pop(next(iter(self._query_cache)), None)
+        self._query_cache[key] = query
+        return query
+
+    def _read_cache_key(self, query, values):
+        """
+        Build the read cache key for a query, None if reads are not cacheable.
+
+        Parameters:
+        - query: The compiled query
+        - values: Tuple of query values
+
+        Returns:
+        - Hashable key or None
+        """
+        if self.cache is None:
+            return None
+        # Reads inside a transaction may see uncommitted rows, they are never cached
+        if self._in_transaction():
+            return None
+        key = (query, values)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _fetch(self, query, values):
+        """
+        Fetch rows, serving repeated reads from the read cache if it is enabled.
+
+        Parameters:
+        - query: The compiled query
+        - values: Tuple of query values
+
+        Returns:
+        - List of row tuples
+        """
+        key = self._read_cache_key(query, values)
+        if key is None:
+            return self.db.fetch(query, values, table=self.name)
+
+        rows = self.cache.get(key)
+        if rows is MISSING:
+            if self._fill_cache_from_primary():
+                rows = tuple(self.db.fetch(query, values, table=self.name, primary=True))
+            else:
+                rows = tuple(self.db.fetch(query, values, table=self.name))
+            self.cache.set(key, rows)
+        return list(rows)
+
+    def _fill_cache_from_primary(self):
+        """
+        Check whether a cache miss has to be read from the primary. Right after a
+        write a replica may not have caught up yet, and its stale rows would stay
+        cached until the next write or cache_ttl.
+        """
+        replicas = getattr(self.db, 'replicas', None)
+        if not isinstance(replicas, list) or not replicas or self._cache_cleared_at is None:
+            return False
+        window = getattr(self.db, 'read_your_writes', None)
+        if window is None:
+            window = self.CACHE_PRIMARY_WINDOW
+        return time.monotonic() - self._cache_cleared_at < window
+
+    def _clear_cache(self):
+        """Drop all cached reads and remember when, see _fill_cache_from_primary."""
+        self.cache.clear()
+        self._cache_cleared_at = time.monotonic()
+
+    def _invalidate_cache(self):
+        """
+        Drop all cached reads after a write. Inside a transaction the cache is
+        cleared again once it ends, so reads of other threads in between can't
+        leave pre-commit data cached.
+        """
+        if self.cache is not None:
+            self._clear_cache()
+            if self._in_transaction():
+                self.db.after_transaction(self._clear_cache)
+
+    def _in_transaction(self):
+        """Check whether the database has a transaction open, AsyncDatabase has none."""
+        in_transaction = getattr(self.db, 'in_transaction', None)
+        return in_transaction is not None and in_transaction()
+
+    def cache_stats(self):
+        """
+        Returns statistics of the read cache.
+
+        Returns:
+        - Dictionary with size, hits, misses, evictions, expirations and invalidations, None if disabled
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def query_cache_stats(self):
+        """
+        Returns statistics of the compiled query cache.
+
+        Returns:
+        - Dictionary with hits, misses and the number of cached queries
+        """
+        return {
+            'hits': self._query_cache_hits,
+            'misses': self._query_cache_misses,
+            'size': len(self._query_cache),
+        }
+
+    def _construct_row(self, object: BaseModel, columns):
+        """
+        Convert the given fields of a model instance into database values.
+
+        Parameters:
+        - object: The Pydantic model instance
+        - columns: The column names to read from the instance
+
+        Returns:
+        - List of converted values in column order
+        """
+        encoders = self._encoders
+        row = []
         for field in columns:
             value = getattr(object, field)
-            
-            if isinstance(value, tuple):
-                data.append(convert_to_pg_array(value))
-            elif isinstance(value, datetime):
-                data.append(convert_to_pg_datetime(value))
-            elif isinstance(value, dict):
-                data.append(convert_to_pg_json(value))
-            else:
-                data.append(value)
-        return query, data
+            encode = encoders.get(field)
+            row.append(value if encode is None or value is None else encode(value))
+        return row
+
+    def _encode_value(self, column, value):
+        """
+        Convert a single value of a column into a database value.
+
+        Parameters:
+        - column: The column name
+        - value: The model value
+
+        Returns:
+        - The converted value
+        """
+        encode = self._encoders.get(column)
+        return value if encode is None or value is None else encode(value)
 
     def _construct_where_clause(self, **kwargs):
         """
@@ -171,44 +933,85 @@ class Table:
         Returns:
         - SQL WHERE clause and list of values to insert into the query
         """
-        if not kwargs:
-            return "", []
+        shape, values = self._construct_filter(**kwargs)
+        return self._construct_where_clause_from_shape(shape), values
 
-        clauses = []
+    def _construct_filter(self, **kwargs):
+        """
+        Splits filtering conditions into their shape and their values.
+
+        Filters with the same shape produce the same WHERE clause, which makes
+        the shape usable as a cache key.
+
+        Parameters:
+        - **kwargs: Keyword arguments specifying the filtering conditions
+
+        Returns:
+        - Tuple of (column, operator, number of IN values) entries and list of values
+        """
+        shape = []
         values = []
 
-        # Iterate through all keyword arguments to construct the WHERE clause
+        # Iterate through all keyword arguments to collect operators and values
         for key, value in kwargs.items():
             if isinstance(value, dict):
                 # Handle LIKE query
                 if 'like' in value:
-                    clauses.append(f"{key} LIKE %s")
+                    shape.append((key, 'like', 1))
                     values.append(value['like'].replace('*','%'))
                 # Handle range query
                 elif 'range' in value:
                     low, high = value['range']
-                    clauses.append(f"{key} >= %s AND {key} <= %s")
+                    shape.append((key, 'range', 2))
                     values.extend([low, high])
                 # Handle IN query
                 elif 'in' in value:
-                    placeholders = ', '.join(['%s'] * len(value['in']))
-                    clauses.append(f"{key} IN ({placeholders})")
+                    shape.append((key, 'in', len(value['in'])))
                     values.extend(value['in'])
                 # Handle greater than query
                 elif 'gt' in value:
-                    clauses.append(f"{key} > %s")
+                    shape.append((key, 'gt', 1))
                     values.append(value['gt'])
                 # Handle less than query
                 elif 'lt' in value:
-                    clauses.append(f"{key} < %s")
+                    shape.append((key, 'lt', 1))
                     values.append(value['lt'])
             else:
-                clauses.append(f"{key} = %s")
+                shape.append((key, 'eq', 1))
                 values.append(value)
 
-        clause = "WHERE " + " AND ".join(clauses)
+        return tuple(shape), values
+
+    def _construct_where_clause_from_shape(self, shape):
+        """
+        Constructs the WHERE clause for a filter shape.
+
+        Parameters:
+        - shape: Filter shape as returned by _construct_filter
+
+        Returns:
+        - SQL WHERE clause
+        """
+        clauses = []
+        for key, operator, size in shape:
+            if operator == 'like':
+                clauses.append(f"{key} LIKE %s")
+            elif operator == 'range':
+                clauses.append(f"{key} >= %s AND {key} <= %s")
+            elif operator == 'in':
+                placeholders = ', '.join(['%s'] * size)
+                clauses.append(f"{key} IN ({placeholders})")
+            elif operator == 'gt':
+                clauses.append(f"{key} > %s")
+            elif operator == 'lt':
+                clauses.append(f"{key} < %s")
+            else:
+                clauses.append(f"{key} = %s")
+
+        if not clauses:
+            return ""
 
-        return clause, values
+        return "WHERE " + " AND ".join(clauses)
 
     def _construct_pagination_clauses(self, offset=None, count=None):
         """
@@ -219,12 +1022,19 @@ class Table:
         - count: Number of records to return
 
         Returns:
-        - SQL LIMIT and OFFSET clauses
+        - SQL LIMIT and OFFSET clauses and list of values to insert into the query
         """
-        limit_clause = f"LIMIT {int(count)}" if count is not None else ""
-        offset_clause = f"OFFSET {int(offset)}" if offset is not None else ""
+        values = []
+        limit_clause = ""
+        offset_clause = ""
+        if count is not None:
+            limit_clause = "LIMIT %s"
+            values.append(int(count))
+        if offset is not None:
+            offset_clause = "OFFSET %s"
+            values.append(int(offset))
 
-        return limit_clause, offset_clause
+        return limit_clause, offset_clause, values
 
     def _construct_order_by_clause(self, sort=None):
         """
@@ -250,7 +1060,7 @@ class Table:
 
         return order_by_clause
 
-    def find_many(self, offset=None, count=None, sort=None, **kwargs):
+    def find_many(self, offset=None, count=None, sort=None, as_='models', fields=None, prefetch=None, **kwargs):
         """
         Finds multiple records based on the given filters, sort order, and pagination options.
 
@@ -258,53 +1068,626 @@ class Table:
         - offset: The offset for pagination.
         - count: The number of records to return.
         - sort: The column to sort the results.
+        - as_: Result format, one of 'models', 'dicts' or 'tuples'. Defaults to 'models'.
+        - fields: Optional list of columns to select. Models are then built partially, without validation.
+        - prefetch: Optional list of relation names to load with one query per relation.
+          The related objects are available as object.related['customer'].
         - **kwargs: Additional filtering criteria.
 
         Returns:
-        - A list of model instances that match the criteria.
+        - A list of model instances (or dicts or tuples) that match the criteria.
         """
-        where_clause, values = self._construct_where_clause(**kwargs)
-        limit_clause, offset_clause = self._construct_pagination_clauses(offset, count)
-        order_by_clause = self._construct_order_by_clause(sort)
-
-        query = f"SELECT * FROM {self.name} {where_clause} {order_by_clause} {limit_clause} {offset_clause}"
+        query, values = self._construct_query_for_find_many(offset, count, sort, fields=fields, **kwargs)
+        results = self._fetch(query, values)
+        objects = self._hydrate(results, as_, fields)
 
-        results = self.db.fetch(query, tuple(values))
+        for relation in prefetch or ():
+            column, table, ids = self._prepare_for_prefetch(objects, relation, as_)
+            related = table._hydrate(table._fetch(table._construct_query_for_prefetch(), (ids,))) if ids else []
+            self._stitch_related(objects, relation, column, related)
+        return objects
 
-        return [self.model(**{column_name: value for column_name, value in zip(self.columns, res)}) for res in results]
-
-    def find_one(self, **kwargs):
+    def _prepare_for_prefetch(self, objects, relation, as_='models'):
         """
-        Finds a single record based on the given filters.
+        Resolve a relation and collect the referenced ids of the objects.
 
         Parameters:
-        - **kwargs: Additional filtering criteria.
+        - objects: The model instances to load related objects for
+        - relation: The relation name
+        - as_: The result format of the objects
 
         Returns:
-        - A single model instance if found, else None.
+        - The foreign key column, the related Table and the list of distinct ids
         """
-        results = self.find_many(count=1, **kwargs)
-        return results[0] if results else None
+        if as_ != 'models':
+            raise ValueError("prefetch requires as_='models'")
+        if relation not in self.relations:
+            raise ValueError(f"Invalid relation: {relation}")
 
-    def count(self, **kwargs):
-        """
-        Returns the total number of records that match the given criteria.
+        column, target = self.relations[relation]
+        tables = getattr(self.db, 'tables', None) or {}
+        table = next((table for table in tables.values() if table.name.lower() == target.lower()), None)
+        if table is None:
+            raise ValueError(f"No table is set up for relation: {relation}")
 
-        Parameters:
-        - **kwargs: Additional filtering criteria.
+        ids = list(dict.fromkeys(value for value in (getattr(object, column, None) for object in objects) if value is not None))
+        return column, table, ids
+
+    def _construct_query_for_prefetch(self):
+        """
+        Construct the query loading all records of a list of ids.
+        The ids are passed as one array, so the query is the same for any number of ids.
 
         Returns:
-        - Integer representing the total number of matching records.
+        - The constructed query
         """
-        where_clause, values = self._construct_where_clause(**kwargs)
+        def build():
+            return f"SELECT {', '.join(self.columns)} FROM {self.name} WHERE id = ANY(%s)"
 
-        query = f"SELECT COUNT(*) FROM {self.name} {where_clause}"
-        total_records = self.db.fetch(query, tuple(values))
-        return total_records[0][0] if total_records else 0
+        return self._compiled_query(('prefetch',), build)
 
-    def add(self, object: BaseModel):
+    def _stitch_related(self, objects, relation, column, related):
         """
-        Adds a new record to the table.
+        Attach loaded related objects to the objects referencing them.
+
+        Parameters:
+        - objects: The model instances holding the foreign key
+        - relation: The relation name
+        - column: The foreign key column
+        - related: The loaded related model instances
+        """
+        by_id = {object.id: object for object in related}
+        for object in objects:
+            object.related[relation] = by_id.get(getattr(object, column, None))
+
+    def _construct_query_for_find_many(self, offset=None, count=None, sort=None, fields=None, **kwargs):
+        """
+        Construct the SELECT query used by find_many.
+
+        Parameters:
+        - offset: The offset for pagination.
+        - count: The number of records to return.
+        - sort: The column to sort the results.
+        - fields: Optional list of columns to select.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - The constructed query and a tuple of values
+        """
+        columns = self._construct_projection(fields)
+        shape, values = self._construct_filter(**kwargs)
+        limit_clause, offset_clause, pagination_values = self._construct_pagination_clauses(offset, count)
+
+        def build():
+            where_clause = self._construct_where_clause_from_shape(shape)
+            order_by_clause = self._construct_order_by_clause(sort)
+            return f"SELECT {', '.join(columns)} FROM {self.name} {where_clause} {order_by_clause} {limit_clause} {offset_clause}"
+
+        key = ('find_many', columns, shape, sort, bool(limit_clause), bool(offset_clause))
+        query = self._compiled_query(key, build)
+        return query, tuple(values + pagination_values)
+
+    def _construct_projection(self, fields=None):
+        """
+        Validate the columns to select.
+
+        Parameters:
+        - fields: List of column names or None for all columns
+
+        Returns:
+        - Tuple of column names
+        """
+        if fields is None:
+            return tuple(self.columns)
+
+        columns = tuple(fields)
+        if not columns:
+            raise ValueError("fields needs at least one column")
+        for column in columns:
+            if column not in self.columns:
+                raise ValueError(f"Invalid field: {column}")
+        return columns
+
+    def _hydrate(self, results, as_='models', fields=None):
+        """
+        Turn fetched rows into the requested result format.
+
+        Parameters:
+        - results: List of row tuples in column order
+        - as_: Result format, one of 'models', 'dicts' or 'tuples'
+        - fields: The selected columns if the rows are a projection
+
+        Returns:
+        - A list of model instances, dicts or tuples
+        """
+        if as_ == 'tuples':
+            return results
+
+        columns = self.columns if fields is None else tuple(fields)
+        if as_ == 'dicts':
+            return [dict(zip(columns, res)) for res in results]
+        if as_ == 'models':
+            if fields is not None:
+                return self._hydrate_partial(results, columns)
+            if self.trusted:
+                # Without validation the driver types have to be converted here
+                decoders = [self._decoders.get(column) for column in columns]
+                if any(decoders):
+                    results = [
+                        [value if decode is None or value is None else decode(value) for value, decode in zip(res, decoders)]
+                        for res in results
+                    ]
+            return [self._model_constructor(**dict(zip(columns, res))) for res in results]
+
+        raise ValueError(f"Invalid result format: {as_}, use one of {', '.join(self.RESULT_FORMATS)}")
+
+    def _hydrate_partial(self, results, columns):
+        """
+        Turn projected rows into partial models holding only the selected columns.
+
+        Parameters:
+        - results: List of row tuples in the order of columns
+        - columns: The selected columns
+
+        Returns:
+        - A list of instances of a PartialModel subclass of the model
+        """
+        if self._partial_model is None:
+            self._partial_model = type(f"Partial{self.model.__name__}", (PartialModel, self.model), {'__module__': self.model.__module__})
+
+        # Partial rows can not pass validation, so the driver types are converted here
+        decoders = [self._decoders.get(column) for column in columns]
+        if any(decoders):
+            results = [
+                [value if decode is None or value is None else decode(value) for value, decode in zip(res, decoders)]
+                for res in results
+            ]
+
+        # model_construct fills in defaults, e.g. a new slug, drop them again so unselected fields stay unset
+        unselected = [name for name in self.model.model_fields if name not in columns]
+        objects = []
+        for res in results:
+            object = self._partial_model.model_construct(**dict(zip(columns, res)))
+            for name in unselected:
+                object.__dict__.pop(name, None)
+            objects.append(object)
+        return objects
+
+    def _check_complete(self, object: BaseModel):
+        """Refuse to insert or replace a partial model, its unselected columns are unknown."""
+        if isinstance(object, PartialModel):
+            raise ValueError(
+                f"{type(object).__name__} only holds the fields {', '.join(sorted(object.model_fields_set))}, "
+                "use update() to write its changes"
+            )
+
+    def iter_many(self, offset=None, count=None, sort=None, batch_size=1000, as_='models', fields=None, **kwargs):
+        """
+        Iterates over records based on the given filters without loading them all into memory.
+
+        Rows are read through a server-side cursor and turned into model instances one batch at a time.
+
+        Parameters:
+        - offset: The offset for pagination.
+        - count: The number of records to return.
+        - sort: The column to sort the results.
+        - batch_size: Number of rows fetched per round trip. Defaults to 1000.
+        - as_: Result format, one of 'models', 'dicts' or 'tuples'. Defaults to 'models'.
+        - fields: Optional list of columns to select.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A generator of model instances (or dicts or tuples) that match the criteria.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size should be 1 or higher")
+
+        query, values = self._construct_query_for_find_many(offset, count, sort, fields=fields, **kwargs)
+        for results in self.db.stream(query, values, batch_size=batch_size, table=self.name):
+            yield from self._hydrate(results, as_, fields)
+
+    def parallel_map(self, fn, workers=None, key='id', chunks=None, ordered=True, batch_size=1000, **kwargs):
+        """
+        Applies a function to every matching record in parallel worker processes.
+
+        The key space is split into ranges of an indexed column. Every worker process
+        opens its own connection, streams and hydrates one range at a time and applies
+        the function. Worker processes are spawned, so fn and the model must be
+        importable at module level.
+
+        Parameters:
+        - fn: Function called with each model instance, its results are returned.
+        - workers: Number of worker processes. Defaults to the number of CPUs.
+        - key: Numeric or timestamp column the ranges are built on. Defaults to 'id'.
+        - chunks: Number of key ranges. Defaults to four per worker, so workers stay busy on skewed data.
+        - ordered: Return the results in key order, else as soon as a range is done.
+        - batch_size: Number of rows fetched per round trip. Defaults to 1000.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A generator of the results of fn.
+        """
+        from .parallel import split_range, init_worker, map_range
+
+        if key not in self.columns:
+            raise ValueError(f"Invalid key column: {key}")
+        workers = workers or os.cpu_count() or 1
+
+        query, values = self._construct_query_for_key_bounds(key, **kwargs)
+        low, high = self.db.fetch(query, values, table=self.name)[0]
+        if low is None:
+            return
+
+        tasks = []
+        for start, end, last in split_range(low, high, chunks or workers * 4):
+            query, values = self._construct_query_for_key_range(key, last, **kwargs)
+            tasks.append((fn, query, tuple(values) + (start, end), batch_size))
+
+        context = multiprocessing.get_context('spawn')
+        initargs = (self.db.connect_kwargs, self.model, self.name, self.trusted)
+        with context.Pool(min(workers, len(tasks)), initializer=init_worker, initargs=initargs) as pool:
+            results = pool.imap(map_range, tasks) if ordered else pool.imap_unordered(map_range, tasks)
+            for chunk in results:
+                yield from chunk
+
+    def _construct_query_for_key_bounds(self, key, **kwargs):
+        """
+        Construct the query for the smallest and largest key of the matching records.
+
+        Parameters:
+        - key: The key column
+        - **kwargs: Filtering criteria
+
+        Returns:
+        - The constructed query and a list of values
+        """
+        shape, values = self._construct_filter(**kwargs)
+
+        def build():
+            where_clause = self._construct_where_clause_from_shape(shape)
+            return f"SELECT MIN({key}), MAX({key}) FROM {self.name} {where_clause}"
+
+        return self._compiled_query(('key_bounds', key, shape), build), values
+
+    def _construct_query_for_key_range(self, key, last=False, **kwargs):
+        """
+        Construct the query for the matching records of one key range.
+
+        Parameters:
+        - key: The key column
+        - last: Whether the range includes its end
+        - **kwargs: Filtering criteria
+
+        Returns:
+        - The constructed query and a list of values, the range start and end have to be appended
+        """
+        shape, values = self._construct_filter(**kwargs)
+
+        def build():
+            where_clause = self._construct_where_clause_from_shape(shape)
+            range_clause = f"{key} >= %s AND {key} {'<=' if last else '<'} %s"
+            where_clause = f"{where_clause} AND {range_clause}" if where_clause else f"WHERE {range_clause}"
+            return f"SELECT {', '.join(self.columns)} FROM {self.name} {where_clause} ORDER BY {key}"
+
+        return self._compiled_query(('key_range', key, last, shape), build), values
+
+    def find_after(self, cursor=None, count=10, sort='id', as_='models', **kwargs):
+        """
+        Finds a page of records following a continuation cursor (keyset pagination).
+
+        Unlike page(), the database seeks directly to the first row of the page, so
+        every page costs about the same regardless of depth. The sort column should
+        not contain NULL values; 'id' is used as a tiebreaker.
+
+        Parameters:
+        - cursor: Continuation token returned by a previous call, None for the first page.
+        - count: The number of records to return. Defaults to 10.
+        - sort: The column to sort the results (optionally prefixed with '-' for DESC).
+        - as_: Result format, one of 'models', 'dicts' or 'tuples'. Defaults to 'models'.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A tuple of the list of model instances and the token for the next page, None on the last page.
+        """
+        query, values = self._construct_query_for_find_after(cursor, count, sort, **kwargs)
+        rows = self.db.fetch(query, values, table=self.name)
+
+        next_cursor = None
+        if count is not None and len(rows) == count:
+            next_cursor = self._encode_cursor(rows[-1], sort)
+
+        return self._hydrate(rows, as_), next_cursor
+
+    def _construct_query_for_find_after(self, cursor=None, count=10, sort='id', **kwargs):
+        """
+        Construct the SELECT query used by find_after.
+
+        Parameters:
+        - cursor: Continuation token or None.
+        - count: The number of records to return.
+        - sort: The column to sort the results.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - The constructed query and a tuple of values
+        """
+        column = sort.lstrip('-')
+        descending = sort.startswith('-')
+
+        shape, values = self._construct_filter(**kwargs)
+        if cursor is not None:
+            last_value, last_id = self._decode_cursor(cursor, sort)
+            values.extend([last_id] if column == 'id' else [last_value, last_id])
+        limit_clause, _, pagination_values = self._construct_pagination_clauses(count=count)
+
+        def build():
+            order_by_clause = self._construct_order_by_clause(sort)
+            if column != 'id':
+                order_by_clause += f", id {'DESC' if descending else 'ASC'}"
+
+            where_clause = self._construct_where_clause_from_shape(shape)
+            if cursor is not None:
+                operator = '<' if descending else '>'
+                seek = f"id {operator} %s" if column == 'id' else f"({column}, id) {operator} (%s, %s)"
+                where_clause = f"{where_clause} AND {seek}" if where_clause else f"WHERE {seek}"
+
+            return f"SELECT {', '.join(self.columns)} FROM {self.name} {where_clause} {order_by_clause} {limit_clause}"
+
+        query = self._compiled_query(('find_after', shape, sort, cursor is not None, bool(limit_clause)), build)
+        return query, tuple(values + pagination_values)
+
+    def _encode_cursor(self, row, sort):
+        """
+        Build an opaque continuation token from the last record of a page.
+
+        Parameters:
+        - row: The last row tuple of the page, in column order
+        - sort: The sort specification the page was fetched with
+
+        Returns:
+        - URL-safe token string
+        """
+        column = sort.lstrip('-')
+        last_value = row[self.columns.index(column)]
+        last_id = row[self.columns.index('id')]
+        payload = json.dumps([sort, last_value, last_id], default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode_cursor(self, cursor, sort):
+        """
+        Decode a continuation token.
+
+        Parameters:
+        - cursor: Token created by _encode_cursor
+        - sort: The sort specification of the current request
+
+        Returns:
+        - Tuple of the last sort value and the last id
+        """
+        try:
+            cursor_sort, last_value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except Exception as e:
+            raise ValueError("Invalid cursor") from e
+        if cursor_sort != sort:
+            raise ValueError(f"Cursor was created for sort '{cursor_sort}', not '{sort}'")
+        return last_value, last_id
+
+    def export(self, path_or_stream, format='csv', fields=None, sort=None, **kwargs):
+        """
+        Exports matching records with COPY (SELECT ...) TO STDOUT, streamed in chunks.
+
+        Parameters:
+        - path_or_stream: File path or binary file-like object to write to.
+        - format: 'csv' (with a header line) or 'binary' (PostgreSQL binary COPY format).
+        - fields: Optional list of columns to export.
+        - sort: The column to sort the results.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - Number of exported records
+        """
+        options = {'csv': "FORMAT csv, HEADER", 'binary': "FORMAT binary"}
+        if format not in options:
+            raise ValueError(f"Invalid export format: {format}, use one of csv, binary")
+
+        query, values = self._construct_query_for_find_many(sort=sort, fields=fields, **kwargs)
+        copy_query = f"COPY ({query}) TO STDOUT WITH ({options[format]})"
+
+        if isinstance(path_or_stream, (str, os.PathLike)):
+            with open(path_or_stream, 'wb') as file:
+                return self.db.copy_out(copy_query, file, values, table=self.name)
+        return self.db.copy_out(copy_query, path_or_stream, values, table=self.name)
+
+    def to_columns(self, fields=None, sort=None, batch_size=10000, use_numpy=None, **kwargs):
+        """
+        Loads matching records column by column, without building model objects.
+
+        Rows are streamed through a server-side cursor. Integer, float and boolean
+        columns are collected into typed arrays; columns of other types, or holding
+        NULL values, into lists.
+
+        Parameters:
+        - fields: Optional list of columns to load.
+        - sort: The column to sort the results.
+        - batch_size: Number of rows fetched per round trip. Defaults to 10000.
+        - use_numpy: Return NumPy arrays. None uses NumPy if it is installed, False returns array.array and lists.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - Dictionary mapping each column to its values
+        """
+        np = None
+        if use_numpy is not False:
+            try:
+                import numpy as np
+            except ImportError:
+                if use_numpy:
+                    raise
+
+        columns = self._construct_projection(fields)
+        query, values = self._construct_query_for_find_many(sort=sort, fields=columns, **kwargs)
+
+        data = {}
+        for column in columns:
+            typecode = self.ARRAY_TYPECODES.get(self._column_sql_type(column).upper())
+            data[column] = array.array(typecode) if typecode else []
+
+        for rows in self.db.stream(query, values, batch_size=batch_size, table=self.name):
+            for column, column_values in zip(columns, zip(*rows)):
+                target = data[column]
+                if isinstance(target, array.array) and None in column_values:
+                    # Typed arrays can't hold NULL
+                    target = data[column] = target.tolist()
+                target.extend(column_values)
+
+        if np is None:
+            return data
+
+        result = {}
+        for column, column_values in data.items():
+            if isinstance(column_values, array.array):
+                result[column] = np.frombuffer(column_values, dtype=column_values.typecode)
+                if self._column_sql_type(column).upper() == "BOOLEAN":
+                    result[column] = result[column].astype(bool)
+            else:
+                result[column] = np.array(column_values, dtype=object)
+        return result
+
+    def find_one(self, **kwargs):
+        """
+        Finds a single record based on the given filters.
+
+        Parameters:
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A single model instance if found, else None.
+        """
+        results = self.find_many(count=1, **kwargs)
+        return results[0] if results else None
+
+    def count(self, **kwargs):
+        """
+        Returns the total number of records that match the given criteria.
+
+        Parameters:
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - Integer representing the total number of matching records.
+        """
+        query, values = self._construct_query_for_count(**kwargs)
+        total_records = self._fetch(query, values)
+        return total_records[0][0] if total_records else 0
+
+    def _construct_query_for_count(self, **kwargs):
+        """
+        Construct the COUNT query used by count.
+
+        Parameters:
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - The constructed query and a tuple of values
+        """
+        shape, values = self._construct_filter(**kwargs)
+
+        def build():
+            where_clause = self._construct_where_clause_from_shape(shape)
+            return f"SELECT COUNT(*) FROM {self.name} {where_clause}"
+
+        query = self._compiled_query(('count', shape), build)
+        return query, tuple(values)
+
+    def aggregate(self, group_by=None, sum=None, avg=None, min=None, max=None, count=False, sort=None, as_='dicts', **kwargs):
+        """
+        Computes aggregates on the server, optionally grouped by columns.
+
+        Parameters:
+        - group_by: Column or list of columns to group by.
+        - sum: Column or list of columns to sum.
+        - avg: Column or list of columns to average.
+        - min: Column or list of columns to take the minimum of.
+        - max: Column or list of columns to take the maximum of.
+        - count: Whether to count the records of each group.
+        - sort: Output name to sort by (optionally prefixed with '-' for DESC), e.g. '-sum_miles'.
+        - as_: Result format, 'dicts' or 'tuples'. Defaults to 'dicts'.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - A list of rows with the group columns first, then 'count' and '<function>_<column>' values.
+        """
+        query, values, names = self._construct_query_for_aggregate(
+            group_by, sum=sum, avg=avg, min=min, max=max, count=count, sort=sort, **kwargs
+        )
+        results = self._fetch(query, values)
+
+        if as_ == 'tuples':
+            return results
+        if as_ == 'dicts':
+            return [dict(zip(names, res)) for res in results]
+        raise ValueError(f"Invalid result format: {as_}, use one of dicts, tuples")
+
+    def _construct_query_for_aggregate(self, group_by=None, sum=None, avg=None, min=None, max=None, count=False, sort=None, **kwargs):
+        """
+        Construct the SELECT ... GROUP BY query used by aggregate.
+
+        Parameters:
+        - group_by: Column or list of columns to group by.
+        - sum, avg, min, max: Column or list of columns per aggregate function.
+        - count: Whether to count the records of each group.
+        - sort: Output name to sort by.
+        - **kwargs: Additional filtering criteria.
+
+        Returns:
+        - The constructed query, a tuple of values and the list of output names
+        """
+        def as_columns(value):
+            columns = (value,) if isinstance(value, str) else tuple(value or ())
+            for column in columns:
+                if column not in self.columns:
+                    raise ValueError(f"Invalid aggregate column: {column}")
+            return columns
+
+        groups = as_columns(group_by)
+        aggregates = tuple(
+            (function, column)
+            for function, columns in (('SUM', sum), ('AVG', avg), ('MIN', min), ('MAX', max))
+            for column in as_columns(columns)
+        )
+        if not count and not aggregates:
+            raise ValueError("aggregate needs count or at least one of sum, avg, min and max")
+
+        names = list(groups)
+        if count:
+            names.append('count')
+        names.extend(f"{function.lower()}_{column}" for function, column in aggregates)
+
+        order_by_clause = ""
+        if sort:
+            direction = "DESC" if sort.startswith('-') else "ASC"
+            if sort.lstrip('-') not in names:
+                raise ValueError(f"Invalid sort column: {sort.lstrip('-')}")
+            order_by_clause = f"ORDER BY {sort.lstrip('-')} {direction}"
+
+        shape, values = self._construct_filter(**kwargs)
+
+        def build():
+            selects = list(groups)
+            if count:
+                selects.append("COUNT(*) AS count")
+            selects.extend(f"{function}({column}) AS {function.lower()}_{column}" for function, column in aggregates)
+            where_clause = self._construct_where_clause_from_shape(shape)
+            group_by_clause = f"GROUP BY {', '.join(groups)}" if groups else ""
+            return f"SELECT {', '.join(selects)} FROM {self.name} {where_clause} {group_by_clause} {order_by_clause}"
+
+        query = self._compiled_query(('aggregate', groups, bool(count), aggregates, shape, sort), build)
+        return query, tuple(values), names
+
+    def add(self, object: BaseModel):
+        """
+        Adds a new record to the table.
+        Invalid objects are skipped, or raise ValidationError inside a transaction.
 
         Parameters:
         - object: The Pydantic model instance representing the record.
@@ -313,21 +1696,145 @@ class Table:
         - None
         """
         try:
-            # Setting current time for 'date_created' and '_date_last_edit'
-            object.date_created = datetime.now()
-            object._date_last_edit = object.date_created
-
-            # Validating the model
-            valid_object = self.model(**object.dict())
+            valid_object = self._prepare_for_insert(object)
             query, data = self._construct_query_for_insert_or_replace(valid_object)
-            self.db.execute(query, data)
+            self.db.execute(query, data, table=self.name)
+            self._invalidate_cache()
 
         except ValidationError as e:
+            # Let a surrounding transaction roll back
+            if self.db.in_transaction():
+                raise
             print(f"Validation error: {e}")
 
+    def _prepare_for_insert(self, object: BaseModel):
+        """
+        Stamp the creation time on an object and validate it against the model.
+
+        Parameters:
+        - object: The Pydantic model instance to insert
+
+        Returns:
+        - A validated model instance, raises ValidationError if invalid
+        """
+        self._check_complete(object)
+
+        # Setting current time for 'date_created' and '_date_last_edit'
+        object.date_created = datetime.now()
+        object._date_last_edit = object.date_created
+
+        # Validating the model
+        return self.model(**object.dict())
+
+    def add_many(self, objects, batch_size=1000, return_ids=False):
+        """
+        Adds many new records to the table using multi-row INSERT statements.
+
+        Parameters:
+        - objects: An iterable of Pydantic model instances.
+        - batch_size: Number of rows sent per INSERT statement. Defaults to 1000.
+        - return_ids: Whether to return the ids generated by the database.
+
+        Returns:
+        - A list of ids in input order if return_ids is set, else None. Invalid objects
+          are skipped and get None at their position, so the list lines up with the input.
+        """
+        ids = []
+        skipped = []
+        for query, rows in self._construct_queries_for_add_many(objects, batch_size, return_ids, skipped):
+            result = self.db.execute_many(query, rows, page_size=len(rows), fetch=return_ids, table=self.name)
+            self._invalidate_cache()
+            if return_ids:
+                ids.extend(row[0] for row in result)
+
+        return self._align_ids(ids, skipped) if return_ids else None
+
+    def _align_ids(self, ids, skipped):
+        """
+        Insert None at the positions of skipped objects.
+
+        Parameters:
+        - ids: The generated ids of the inserted objects, in input order
+        - skipped: Input positions of the objects that were skipped
+
+        Returns:
+        - List of ids with one entry per input object
+        """
+        skipped = set(skipped)
+        remaining = iter(ids)
+        return [None if index in skipped else next(remaining) for index in range(len(ids) + len(skipped))]
+
+    def _construct_queries_for_add_many(self, objects, batch_size=1000, return_ids=False, skipped=None):
+        """
+        Validate objects and group them into multi-row INSERT batches.
+
+        Parameters:
+        - objects: An iterable of Pydantic model instances.
+        - batch_size: Maximum number of rows per batch.
+        - return_ids: Whether the queries should return the generated ids.
+        - skipped: Optional list the input positions of invalid objects are appended to.
+
+        Yields:
+        - The constructed query with a single VALUES %s placeholder and its list of rows
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size should be 1 or higher")
+
+        batch = []
+        batch_has_id = None
+
+        for index, object in enumerate(objects):
+            try:
+                valid_object = self._prepare_for_insert(object)
+            except ValidationError as e:
+                # Let a surrounding transaction roll back instead of committing without the row
+                if self._in_transaction():
+                    raise
+                print(f"Validation error: {e}")
+                if skipped is not None:
+                    skipped.append(index)
+                continue
+
+            # Rows with and without an explicit id need different column lists
+            has_id = getattr(valid_object, "id", None) is not None
+            if batch and (has_id != batch_has_id or len(batch) >= batch_size):
+                yield self._construct_query_for_insert_batch(batch, batch_has_id, return_ids)
+                batch = []
+            batch_has_id = has_id
+            batch.append(valid_object)
+
+        if batch:
+            yield self._construct_query_for_insert_batch(batch, batch_has_id, return_ids)
+
+    def _construct_query_for_insert_batch(self, objects, with_id, return_ids):
+        """
+        Construct a multi-row INSERT for a batch of validated objects.
+
+        Parameters:
+        - objects: Validated Pydantic model instances
+        - with_id: Whether the objects carry an explicit id
+        - return_ids: Whether to return the generated ids
+
+        Returns:
+        - The constructed query and its list of rows
+        """
+        columns = self.columns.copy()
+        if not with_id:
+            columns.remove('id')
+
+        def build():
+            columns_str = ', '.join(columns)
+            returning = "RETURNING id" if return_ids else ""
+            return f"INSERT INTO {self.name} ({columns_str}) VALUES %s {returning}"
+
+        query = self._compiled_query(('insert_batch', with_id, return_ids), build)
+        rows = [self._construct_row(object, columns) for object in objects]
+        return query, rows
+
     def replace(self, object: BaseModel):
         """
         Replaces an existing record in the table.
+        Partial models from find_many(fields=[...]) raise ValueError, use update() for them.
 
         Parameters:
         - object: The Pydantic model instance representing the new state of the record.
@@ -335,15 +1842,244 @@ class Table:
         Returns:
         - None
         """
+        self._check_complete(object)
         try:
-            # Updating the last edit time
-            object._date_last_edit = datetime.now()
-
-            query, data = self._construct_query_for_insert_or_replace(object, replace=True)
-            self.db.execute(query, data)
+            query, data = self._prepare_for_replace(object)
+            self.db.execute(query, data, table=self.name)
+            self._invalidate_cache()
+            self._mark_clean(object)
         except Exception as e:
+            # Let a surrounding transaction roll back
+            if self.db.in_transaction():
+                raise
             print(f"Error replacing record: {e}")
 
+    def update(self, object: BaseModel):
+        """
+        Writes only the fields of a record that changed since it was loaded.
+
+        Objects without change tracking (not derived from ObjectBaseModel) have all
+        their fields written. 'date_last_edit' is refreshed if the model has it.
+
+        Parameters:
+        - object: The Pydantic model instance with an id.
+
+        Returns:
+        - Number of updated records, 0 if nothing changed
+        """
+        query, data = self._prepare_for_update(object)
+        if query is None:
+            return 0
+
+        updated = self.db.execute(query, data, table=self.name)
+        self._invalidate_cache()
+        self._mark_clean(object)
+        return updated
+
+    def _prepare_for_update(self, object: BaseModel):
+        """
+        Construct the partial UPDATE query for the changed fields of an object.
+
+        Parameters:
+        - object: The Pydantic model instance with an id
+
+        Returns:
+        - The constructed query and data, (None, None) if nothing changed
+        """
+        if getattr(object, "id", None) is None:
+            raise ValueError("Only records with an id can be updated")
+
+        changed = getattr(object, 'changed_fields', None)
+        if changed is None:
+            # A partial model only has the selected fields to write
+            changed = set(object.model_fields_set) if isinstance(object, PartialModel) else set(self.columns)
+        if not changed - {'id'}:
+            return None, None
+
+        if 'date_last_edit' in self.columns:
+            object.date_last_edit = datetime.now()
+            changed = changed | {'date_last_edit'}
+
+        # Keep column order stable so equal change sets share a compiled query
+        columns = [column for column in self.columns if column in changed and column != 'id']
+
+        def build():
+            assignments = ', '.join(f"{column} = %s" for column in columns)
+            return f"UPDATE {self.name} SET {assignments} WHERE id = %s"
+
+        query = self._compiled_query(('update', tuple(columns)), build)
+        return query, self._construct_row(object, columns) + [object.id]
+
+    def update_where(self, filters, **set_values):
+        """
+        Updates all records matching the filters on the server, without loading them.
+
+        Parameters:
+        - filters: Dictionary of filtering criteria in find_many syntax, at least one is required.
+        - **set_values: Columns and their new values.
+
+        Returns:
+        - Number of updated records
+        """
+        query, values = self._construct_query_for_update_where(filters, **set_values)
+        updated = self.db.execute(query, values, table=self.name)
+        self._invalidate_cache()
+        return updated
+
+    def _construct_query_for_update_where(self, filters, **set_values):
+        """
+        Construct the UPDATE query used by update_where.
+
+        Parameters:
+        - filters: Dictionary of filtering criteria.
+        - **set_values: Columns and their new values.
+
+        Returns:
+        - The constructed query and a tuple of values
+        """
+        if not filters:
+            raise ValueError("update_where needs at least one filter")
+        if not set_values:
+            raise ValueError("update_where needs at least one value to set")
+        for column in set_values:
+            if column not in self.columns or column == 'id':
+                raise ValueError(f"Invalid update column: {column}")
+
+        shape, where_values = self._construct_filter(**filters)
+        columns = tuple(set_values)
+
+        def build():
+            assignments = ', '.join(f"{column} = %s" for column in columns)
+            where_clause = self._construct_where_clause_from_shape(shape)
+            return f"UPDATE {self.name} SET {assignments} {where_clause}"
+
+        query = self._compiled_query(('update_where', columns, shape), build)
+        values = [self._encode_value(column, value) for column, value in set_values.items()]
+        return query, tuple(values + where_values)
+
+    def _mark_clean(self, object: BaseModel):
+        """Forget the tracked changes of an object after it has been written."""
+        if hasattr(object, 'mark_clean'):
+            object.mark_clean()
+
+    def _prepare_for_replace(self, object: BaseModel):
+        """
+        Stamp the edit time on an object and construct its upsert query.
+
+        Parameters:
+        - object: The Pydantic model instance to replace
+
+        Returns:
+        - The constructed query and data
+        """
+        # Updating the last edit time
+        object._date_last_edit = datetime.now()
+
+        return self._construct_query_for_insert_or_replace(object, replace=True)
+
+    def replace_many(self, objects, batch_size=1000, copy_threshold=10000):
+        """
+        Replaces many records in the table with set-based upserts.
+
+        Small sets are sent as multi-row INSERT ... ON CONFLICT statements. Sets of
+        copy_threshold objects or more are loaded into a temporary staging table with
+        COPY and upserted from there with a single statement, inside a transaction.
+        If the same id occurs more than once, the last object wins.
+
+        Parameters:
+        - objects: An iterable of Pydantic model instances with ids.
+        - batch_size: Number of rows sent per statement or COPY chunk. Defaults to 1000.
+        - copy_threshold: Number of objects from which the COPY path is used. Defaults to 10000.
+
+        Returns:
+        - Number of records written
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size should be 1 or higher")
+
+        # An upsert can not touch the same row twice
+        objects = list({object.id: object for object in objects}.values())
+        now = datetime.now()
+        for object in objects:
+            self._check_complete(object)
+            # Updating the last edit time
+            object._date_last_edit = now
+
+        if not objects:
+            return 0
+
+        if len(objects) >= copy_threshold:
+            total = self._replace_many_with_copy(objects, batch_size)
+        else:
+            total = 0
+            query = self._construct_query_for_replace_batch()
+            for start in range(0, len(objects), batch_size):
+                rows = [self._construct_row(object, self.columns) for object in objects[start:start + batch_size]]
+                self.db.execute_many(query, rows, page_size=len(rows), table=self.name)
+                total += len(rows)
+
+        self._invalidate_cache()
+        return total
+
+    def _replace_many_with_copy(self, objects, batch_size):
+        """
+        Upserts objects through a temporary staging table filled with COPY.
+
+        Parameters:
+        - objects: Pydantic model instances with unique ids
+        - batch_size: Number of rows per COPY chunk
+
+        Returns:
+        - Number of records written
+        """
+        # Temp tables are private to the session, so a fixed name keeps the statement texts constant
+        staging = f"{self.name}_staging".lower()
+        columns_str = ', '.join(self.columns)
+
+        with self.db.transaction():
+            self.db.execute(
+                f"CREATE TEMP TABLE {staging} (LIKE {self.name} INCLUDING DEFAULTS) ON COMMIT DROP",
+                table=self.name
+            )
+            copy_query = f"COPY {staging} ({columns_str}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+            for start in range(0, len(objects), batch_size):
+                rows = [self._construct_row(object, self.columns) for object in objects[start:start + batch_size]]
+                self.db.copy_in(copy_query, self._construct_copy_data(rows), table=self.name)
+
+            query = f"""
+                INSERT INTO {self.name} ({columns_str}) SELECT {columns_str} FROM {staging}
+                {self._construct_conflict_clause(self.columns)}
+            """
+            written = self.db.execute(query, table=self.name)
+            # Drop it right away, so a later call in the same transaction can create it again
+            self.db.execute(f"DROP TABLE {staging}", table=self.name)
+            return written
+
+    def _construct_copy_data(self, rows):
+        """
+        Format converted rows as CSV input for COPY.
+
+        Parameters:
+        - rows: Lists of converted values in column order
+
+        Returns:
+        - File-like object with the CSV data
+        """
+        return io.StringIO(''.join(','.join(map(convert_to_pg_copy_field, row)) + '\n' for row in rows))
+
+    def _construct_query_for_replace_batch(self):
+        """
+        Construct a multi-row upsert with a single VALUES %s placeholder.
+
+        Returns:
+        - The constructed query
+        """
+        def build():
+            columns_str = ', '.join(self.columns)
+            return f"INSERT INTO {self.name} ({columns_str}) VALUES %s {self._construct_conflict_clause(self.columns)}"
+
+        return self._compiled_query(('replace_batch',), build)
+
     def delete(self, object: BaseModel):
         """
         Deletes a record from the table.
@@ -355,14 +2091,68 @@ class Table:
         - None
         """
         # Constructing the SQL query for the delete operation
-        query = f'DELETE FROM {self.name} WHERE id = %s'
+        query, data = self._construct_query_for_delete(object)
 
         try:
             # Executing the SQL query to delete the record
-            self.db.execute(query, (object.id,))
+            self.db.execute(query, data, table=self.name)
+            self._invalidate_cache()
         except Exception as e:
+            # Let a surrounding transaction roll back
+            if self.db.in_transaction():
+                raise
             print(f"Error deleting record: {e}")
 
+    def _construct_query_for_delete(self, object: BaseModel):
+        """
+        Construct the DELETE query for a single record.
+
+        Parameters:
+        - object: The Pydantic model instance to delete
+
+        Returns:
+        - The constructed query and data
+        """
+        query = self._compiled_query(('delete',), lambda: f'DELETE FROM {self.name} WHERE id = %s')
+        return query, (object.id,)
+
+    def delete_where(self, **kwargs):
+        """
+        Deletes all records matching the given filters with a single statement.
+
+        Parameters:
+        - **kwargs: Filtering criteria, at least one is required.
+
+        Returns:
+        - Number of deleted records
+        """
+        query, values = self._construct_query_for_delete_where(**kwargs)
+        deleted = self.db.execute(query, values, table=self.name)
+        self._invalidate_cache()
+        return deleted
+
+    def _construct_query_for_delete_where(self, **kwargs):
+        """
+        Construct the DELETE query used by delete_where.
+
+        Parameters:
+        - **kwargs: Filtering criteria.
+
+        Returns:
+        - The constructed query and a tuple of values
+        """
+        if not kwargs:
+            raise ValueError("delete_where needs at least one filter")
+
+        shape, values = self._construct_filter(**kwargs)
+
+        def build():
+            where_clause = self._construct_where_clause_from_shape(shape)
+            return f"DELETE FROM {self.name} {where_clause}"
+
+        query = self._compiled_query(('delete_where', shape), build)
+        return query, tuple(values)
+
     def page(self, page_number, page_size=10, **kwargs):
         """
         Paginates through the records in the table based on the given page number and size.
@@ -375,15 +2165,28 @@ class Table:
         Returns:
         - A list of model instances representing the current page's data.
         """
+        offset = self._construct_page_offset(page_number, page_size)
+
+        # Use find_many to fetch the desired records
+        return self.find_many(offset=offset, count=page_size, **kwargs)
+
+    def _construct_page_offset(self, page_number, page_size):
+        """
+        Validate a page number and calculate its offset.
+
+        Parameters:
+        - page_number: The current page number, starts from 1.
+        - page_size: Number of records per page.
+
+        Returns:
+        - The offset of the first record on the page
+        """
         # Validate page_number
         if page_number <= 0:
             raise ValueError("Page number should be 1 or higher")
 
         # Calculate the offset based on the page number and size
-        offset = (page_number - 1) * page_size
-
-        # Use find_many to fetch the desired records
-        return self.find_many(offset=offset, count=page_size, **kwargs)
+        return (page_number - 1) * page_size
 
     def page_count(self, page_size=10, **kwargs):
         """
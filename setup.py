@@ -6,12 +6,16 @@ with open("README.md", "r", encoding="utf-8") as fh:
 setup(
     name='pydanql',
     version='0.24-alpha',
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'benchmarks', 'benchmarks.*']),
     install_requires=[
         'psycopg2>=2.9.0',
         'pydantic>=2.3.0',
         'inflect>=7.0.0'
     ],
+    extras_require={
+        'async': ['psycopg[pool]>=3.1'],
+        'numpy': ['numpy'],
+    },
     author='Daniel Nümm',
     author_email='pydanql@blacktre.es',
     description='',
@@ -0,0 +1,68 @@
+import asyncio
+from unittest.mock import AsyncMock
+from pydanql.aio import AsyncTable
+from pydanql.model import ObjectBaseModel
+
+
+class Book(ObjectBaseModel):
+    name: str
+    author: str
+    year: int
+
+
+def test_async_table_shares_query_construction():
+    db = AsyncMock()
+    table = AsyncTable(db, Book)
+    db.execute.assert_not_called()
+
+    db.fetch.return_value = [(1, None, None, "slug", "Dune", "Frank Herbert", 1965)]
+    books = asyncio.run(table.find_many(author="Frank Herbert", count=5))
+
+    create_query = db.execute.call_args.args[0]
+    assert create_query.startswith("CREATE TABLE IF NOT EXISTS Books")
+    query, values = db.fetch.call_args.args
+    assert query == table._construct_query_for_find_many(count=5, author="Frank Herbert")[0]
+    assert values == ("Frank Herbert", 5)
+    assert books[0].name == "Dune"
+
+
+def test_concurrent_first_calls_create_the_table_once():
+    db = AsyncMock()
+    table = AsyncTable(db, Book)
+    db.fetch.return_value = []
+
+    async def slow_execute(query, params=(), table=None):
+        # Let the other coroutines reach _ensure_table while the DDL runs
+        await asyncio.sleep(0.01)
+    db.execute.side_effect = slow_execute
+
+    async def main():
+        await asyncio.gather(*(table.find_many(author="X") for _ in range(10)))
+    asyncio.run(main())
+
+    queries = [call.args[0] for call in db.execute.call_args_list]
+    assert queries == table._construct_queries_for_create_table()
+    assert db.fetch.call_count == 10
+
+
+def test_async_add_many_skips_invalid_objects():
+    from pydanql.aio import AsyncDatabase
+
+    db = AsyncMock(spec=AsyncDatabase)
+    table = AsyncTable(db, Book)
+    db.execute_many.return_value = [(4,)]
+    invalid = Book.model_construct(name="A", author="X", year="not a year")
+
+    ids = asyncio.run(table.add_many([invalid, Book(name="B", author="X", year=1)], return_ids=True))
+
+    assert ids == [None, 4]
+
+
+def test_async_table_rejects_sync_only_methods():
+    import pytest
+
+    table = AsyncTable(AsyncMock(), Book)
+
+    for method in ('iter_many', 'export', 'to_columns', 'parallel_map', 'maintain_partitions'):
+        with pytest.raises(NotImplementedError):
+            getattr(table, method)()
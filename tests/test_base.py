@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, MagicMock, patch
 from pydanql.base import Database
 from pydanql.errors import DatabaseError
 
@@ -8,3 +8,190 @@ def test_database_initialization():
     with patch('psycopg2.connect', return_value=Mock()):
         db = Database()
         assert db is not None
+
+
+def test_pooled_database_checks_out_per_operation():
+    with patch('psycopg2.connect', side_effect=lambda **kwargs: MagicMock(closed=0)):
+        db = Database(pool_min=1, pool_max=2)
+        db.execute("SELECT 1")
+        db.fetch("SELECT 1")
+
+        stats = db.pool_stats()
+        assert stats['checkouts'] == 2
+        assert stats['in_use'] == 0
+        assert db.conn is None
+
+
+def test_transaction_commits_once_and_uses_savepoints():
+    conn = MagicMock(closed=0)
+    with patch('psycopg2.connect', return_value=conn):
+        db = Database()
+
+    with db.transaction():
+        db.execute("INSERT INTO books (name) VALUES (%s)", ("A",))
+        with pytest.raises(ValueError):
+            with db.transaction():
+                db.execute("INSERT INTO books (name) VALUES (%s)", ("B",))
+                raise ValueError
+        db.execute("INSERT INTO books (name) VALUES (%s)", ("C",))
+
+    statements = [call.args[0] for call in conn.cursor.return_value.execute.call_args_list]
+    assert "SAVEPOINT pydanql_savepoint_1" in statements
+    assert "ROLLBACK TO SAVEPOINT pydanql_savepoint_1" in statements
+    assert conn.commit.call_count == 1
+    assert not db.in_transaction()
+
+
+def test_transaction_rolls_back_on_error():
+    conn = MagicMock(closed=0)
+    with patch('psycopg2.connect', return_value=conn):
+        db = Database()
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.execute("DELETE FROM books")
+            raise RuntimeError
+
+    conn.commit.assert_not_called()
+    assert conn.rollback.call_count == 2
+
+
+def test_instrumentation_hooks_and_histograms():
+    conn = MagicMock(closed=0)
+    conn.cursor.return_value.fetchall.return_value = [(1,), (2,)]
+    with patch('psycopg2.connect', return_value=conn):
+        db = Database(slow_query_threshold=0)
+
+    events = []
+    db.instrumentation.add_hook(after=events.append)
+    db.fetch("SELECT id FROM books WHERE name = %s", ("secret",), table="books")
+
+    event = events[0]
+    assert (event.operation, event.table, event.rowcount) == ('fetch', 'books', 2)
+    assert event.duration >= 0
+    histogram = db.instrumentation.histograms()["SELECT id FROM books WHERE name = %s"]
+    assert histogram['count'] == 1
+    assert histogram['buckets'][float('inf')] == 1
+
+
+def test_instrumentation_caps_the_number_of_histograms():
+    from pydanql.instrumentation import Instrumentation, OTHER_STATEMENTS
+
+    instrumentation = Instrumentation(max_histograms=2)
+    for index in range(5):
+        instrumentation.after(instrumentation.before(f"SELECT {index}", ()))
+    instrumentation.after(instrumentation.before("SELECT 0", ()))
+
+    histograms = instrumentation.histograms()
+    assert set(histograms) == {"SELECT 0", "SELECT 1", OTHER_STATEMENTS}
+    assert histograms["SELECT 0"]['count'] == 2
+    assert histograms[OTHER_STATEMENTS]['count'] == 3
+
+
+def test_sync_schema_creates_only_missing_tables():
+    from pydanql.model import ObjectBaseModel
+    from pydanql.table import Table
+
+    class Author(ObjectBaseModel):
+        name: str
+
+    class Book(ObjectBaseModel):
+        title: str
+
+    conn = MagicMock(closed=0)
+    with patch('psycopg2.connect', return_value=conn):
+        db = Database(schema_sync='deferred')
+    cursor = conn.cursor.return_value
+    Table(db, Author)
+    Table(db, Book)
+    cursor.execute.assert_not_called()
+
+    cursor.fetchall.side_effect = [[("authors",)], [("authors_pkey",)]]
+    queries = db.sync_schema()
+
+    assert len(queries) == 1 and queries[0].startswith("CREATE TABLE IF NOT EXISTS Books")
+    assert conn.commit.call_count == 1
+    with pytest.raises(ValueError):
+        Database(schema_sync='lazy')
+
+
+def test_reads_are_routed_to_replicas():
+    conns = {host: MagicMock(closed=0) for host in ('primary', 'replica-1', 'replica-2')}
+
+    with patch('psycopg2.connect', side_effect=lambda **kwargs: conns[kwargs['host']]):
+        db = Database(host='primary', replicas=[{'host': 'replica-1'}, {'host': 'replica-2'}], read_your_writes=60)
+
+    def statements(host):
+        cursor = conns[host].cursor.return_value
+        return [call.args[0] for call in (cursor.execute.call_args_list + cursor.__enter__.return_value.execute.call_args_list)]
+
+    db.fetch("SELECT 1")
+    db.fetch("SELECT 2")
+    assert statements('replica-1') == ["SELECT 1"]
+    assert statements('replica-2') == ["SELECT 2"]
+
+    with db.transaction():
+        db.fetch("SELECT 3")
+    db.execute("UPDATE books SET year = 1")
+    db.fetch("SELECT 4")
+    assert statements('primary') == ["SELECT 3", "UPDATE books SET year = 1", "SELECT 4"]
+
+
+def test_stream_survives_writes_on_the_shared_connection():
+    conn = MagicMock(closed=0)
+    with patch('psycopg2.connect', return_value=conn):
+        db = Database()
+    named_cursor = conn.cursor.return_value.__enter__.return_value
+    named_cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+    seen = []
+    for rows in db.stream("SELECT id FROM books", batch_size=2):
+        for (id,) in rows:
+            db.execute("UPDATE books SET year = 1 WHERE id = %s", (id,))
+            seen.append(id)
+
+    assert seen == [1, 2, 3]
+    name_call = next(call for call in conn.cursor.call_args_list if call.kwargs.get('name'))
+    assert name_call.kwargs['withhold'] is True
+
+
+def test_stream_survives_transactions_on_the_shared_connection():
+    from pydanql.table import Table
+    from pydanql.model import ObjectBaseModel
+
+    class Book(ObjectBaseModel):
+        name: str
+
+    conn = MagicMock(closed=0)
+    with patch('psycopg2.connect', return_value=conn):
+        db = Database(schema_sync='off')
+    table = Table(db, Book)
+
+    # A WITH HOLD cursor is dropped when its declaring transaction rolls back
+    state = {'declared': False, 'committed': False, 'dropped': False}
+    named_cursor = conn.cursor.return_value.__enter__.return_value
+    def declare(*args):
+        state.update(declared=True, committed=False)
+    def commit():
+        state['committed'] = True
+    def rollback():
+        if state['declared'] and not state['committed']:
+            state['dropped'] = True
+    batches = iter([[(1, None, None, "a", "Dune")], [(2, None, None, "b", "Emma")], []])
+    def fetchmany(size):
+        if state['dropped']:
+            raise Exception('cursor "pydanql_..." does not exist')
+        return next(batches)
+    named_cursor.execute.side_effect = declare
+    named_cursor.fetchmany.side_effect = fetchmany
+    conn.commit.side_effect = commit
+    conn.rollback.side_effect = rollback
+
+    seen = []
+    for book in table.iter_many(batch_size=1):
+        with db.transaction():
+            book.name = book.name.upper()
+            table.update(book)
+        seen.append(book.name)
+
+    assert seen == ["DUNE", "EMMA"]
@@ -0,0 +1,613 @@
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+from pydanql.base import Database
+from pydanql.table import Table
+from pydanql.model import ObjectBaseModel
+
+
+class Book(ObjectBaseModel):
+    name: str
+    author: str
+    year: int
+
+
+def make_table():
+    db = Mock()
+    table = Table(db, Book)
+    db.reset_mock()
+    return db, table
+
+
+def test_add_many_batches_rows():
+    db, table = make_table()
+    db.execute_many.return_value = [(1,), (2,)]
+    books = [Book(name=f"Book {i}", author="Author", year=2000 + i) for i in range(5)]
+
+    ids = table.add_many(books, batch_size=2, return_ids=True)
+
+    assert db.execute_many.call_count == 3
+    query, rows = db.execute_many.call_args_list[0].args
+    assert query.startswith("INSERT INTO Books (date_created")
+    assert "RETURNING id" in query
+    assert len(rows) == 2
+    assert ids == [1, 2, 1, 2, 1, 2]
+
+
+def test_add_many_splits_on_explicit_id():
+    db, table = make_table()
+    books = [Book(name="A", author="X", year=1), Book(id=7, name="B", author="X", year=2)]
+
+    assert table.add_many(books) is None
+
+    first, second = [call.args[0] for call in db.execute_many.call_args_list]
+    assert "(id," not in first
+    assert "(id," in second
+
+
+def test_invalid_objects_raise_inside_transactions():
+    from pydantic import ValidationError
+
+    db, table = make_table()
+    invalid = Book.model_construct(name="A", author="X", year="not a year")
+
+    db.in_transaction.return_value = True
+    with pytest.raises(ValidationError):
+        table.add(invalid)
+    with pytest.raises(ValidationError):
+        table.add_many([Book(name="B", author="X", year=1), invalid])
+    db.execute.assert_not_called()
+    db.execute_many.assert_not_called()
+
+    db.in_transaction.return_value = False
+    table.add(invalid)
+    db.execute_many.return_value = [(5,), (6,)]
+    ids = table.add_many([Book(name="B", author="X", year=1), invalid, Book(name="C", author="X", year=2)], return_ids=True)
+    assert len(db.execute_many.call_args.args[1]) == 2
+    assert ids == [5, None, 6]
+
+
+def test_iter_many_hydrates_per_batch():
+    db, table = make_table()
+    row = (1, None, None, "slug", "Dune", "Frank Herbert", 1965)
+    db.stream.return_value = iter([[row, row], [row]])
+
+    books = table.iter_many(author="Frank Herbert", batch_size=2)
+
+    db.stream.assert_not_called()
+    assert [book.name for book in books] == ["Dune"] * 3
+    query, values = db.stream.call_args.args
+    assert "WHERE author = %s" in query
+    assert db.stream.call_args.kwargs == {'batch_size': 2, 'table': 'Books'}
+
+
+def test_find_after_seeks_past_cursor():
+    db, table = make_table()
+    db.fetch.return_value = [
+        (3, None, None, "a", "Dune", "Frank Herbert", 1965),
+        (9, None, None, "b", "Emma", "Jane Austen", 1965),
+    ]
+
+    books, cursor = table.find_after(count=2, sort='-year')
+    assert cursor is not None
+    assert "ORDER BY year DESC, id DESC LIMIT %s" in db.fetch.call_args.args[0]
+
+    db.fetch.return_value = []
+    books, next_cursor = table.find_after(cursor, count=2, sort='-year', author='X')
+    query, values = db.fetch.call_args.args
+    assert "WHERE author = %s AND (year, id) < (%s, %s)" in query
+    assert values == ("X", 1965, 9, 2)
+    assert books == [] and next_cursor is None
+
+    with pytest.raises(ValueError):
+        table.find_after(cursor, count=2, sort='year')
+
+
+def test_query_cache_is_keyed_by_filter_shape():
+    db, table = make_table()
+    db.fetch.return_value = []
+
+    table.find_many(author="A", year={'in': [1, 2]}, count=5)
+    table.find_many(author="B", year={'in': [3, 4]}, count=10)
+    table.find_many(author="B", year={'in': [3, 4, 5]}, count=10)
+
+    first, second, third = db.fetch.call_args_list
+    assert first.args[0] is second.args[0]
+    assert second.args[1] == ("B", 3, 4, 10)
+    assert "IN (%s, %s, %s)" in third.args[0]
+    assert table.query_cache_stats() == {'hits': 1, 'misses': 2, 'size': 2}
+
+
+def test_find_many_result_formats():
+    db, table = make_table()
+    row = (1, None, None, "slug", "Dune", "Frank Herbert", 1965)
+    db.fetch.return_value = [row]
+
+    assert table.find_many(as_='tuples') == [row]
+    assert table.find_many(as_='dicts')[0]['author'] == "Frank Herbert"
+    assert db.fetch.call_args.args[0].startswith(
+        "SELECT id, date_created, date_last_edit, slug, name, author, year FROM Books"
+    )
+    with pytest.raises(ValueError):
+        table.find_many(as_='rows')
+
+
+def test_trusted_table_skips_validation():
+    db = Mock()
+    table = Table(db, Book, trusted=True)
+    db.fetch.return_value = [(1, None, None, "slug", "Dune", "Frank Herbert", "not a year")]
+
+    book = table.find_one()
+
+    assert isinstance(book, Book)
+    assert book.year == "not a year"
+
+
+def test_native_types_are_encoded_and_decoded():
+    from datetime import datetime
+    from typing import Optional, Tuple
+    from pydantic import BaseModel
+    from psycopg2.extras import Json
+
+    class Address(BaseModel):
+        city: str
+
+    class Shop(ObjectBaseModel):
+        opened: datetime
+        tags: Tuple[str, ...]
+        ratings: Optional[Tuple[int, ...]]
+        meta: dict
+        address: Address
+
+    db = Mock()
+    table = Table(db, Shop, trusted=True)
+    schema = db.execute.call_args_list[0].args[0]
+
+    assert "opened TIMESTAMPTZ NOT NULL" in schema
+    assert "tags TEXT[] NOT NULL" in schema
+    assert "ratings INTEGER[] NULL" in schema
+    assert "meta JSONB NOT NULL" in schema
+    assert "address JSONB NOT NULL" in schema
+
+    opened = datetime(2024, 1, 1)
+    shop = Shop(opened=opened, tags=("a,b", 'c"d'), ratings=None, meta={'since': opened}, address=Address(city="Bonn"))
+    opened_value, tags, ratings, meta, address = table._construct_row(shop, ['opened', 'tags', 'ratings', 'meta', 'address'])
+
+    assert opened_value is opened
+    assert tags == ["a,b", 'c"d']
+    assert ratings is None
+    assert isinstance(meta, Json) and meta.dumps(meta.adapted) == '{"since": "2024-01-01T00:00:00"}'
+    assert address.dumps(address.adapted) == '{"city": "Bonn"}'
+
+    db.fetch.return_value = [(1, None, None, "slug", opened, ["x"], [4, 5], {}, {"city": "Bonn"})]
+    shop = table.find_one()
+
+    assert shop.tags == ("x",) and shop.ratings == (4, 5)
+    assert shop.address == Address(city="Bonn")
+
+
+def test_sequences_of_models_are_stored_as_json():
+    from typing import Dict, List, Tuple
+    from pydantic import BaseModel
+    from psycopg2.extras import Json
+
+    class Item(BaseModel):
+        sku: str
+        qty: int
+
+    class Order(ObjectBaseModel):
+        items: List[Item]
+        counts: List[Dict[str, int]]
+        pairs: Tuple[Tuple[int, int], ...]
+        codes: List[str]
+
+    for trusted in (False, True):
+        db = Mock()
+        table = Table(db, Order, trusted=trusted)
+        schema = db.execute.call_args_list[0].args[0]
+
+        assert "items JSONB NOT NULL" in schema
+        assert "counts JSONB NOT NULL" in schema
+        assert "pairs JSONB NOT NULL" in schema
+        assert "codes TEXT[] NOT NULL" in schema
+
+        order = Order(items=[Item(sku='a', qty=1)], counts=[{'a': 1}], pairs=((1, 2),), codes=['x'])
+        items, counts, pairs = table._construct_row(order, ['items', 'counts', 'pairs'])
+        assert isinstance(items, Json) and items.dumps(items.adapted) == '[{"sku": "a", "qty": 1}]'
+        assert pairs.dumps(pairs.adapted) == '[[1, 2]]'
+
+        # The driver returns JSON columns as lists of dicts and lists
+        db.fetch.return_value = [(1, None, None, "slug", [{'sku': 'a', 'qty': 1}], [{'a': 1}], [[1, 2]], ['x'])]
+        loaded = table.find_one()
+        assert loaded.items == [Item(sku='a', qty=1)]
+        assert loaded.counts == [{'a': 1}]
+        assert loaded.pairs == ((1, 2),)
+
+
+def test_find_many_prefetches_related_models():
+    from typing import Optional
+    from pydantic import Field
+
+    class Customer(ObjectBaseModel):
+        name: str
+
+    class Order(ObjectBaseModel):
+        customer_id: Optional[int] = Field(default=None, references='Customers', on_delete='CASCADE')
+
+    db = Mock()
+    db.tables = {}
+    customers = Table(db, Customer)
+    orders = Table(db, Order)
+
+    # References are plain table names, so the model stays usable for JSON schema / OpenAPI
+    assert Order.model_json_schema()['properties']['customer_id']['references'] == 'Customers'
+
+    assert "customer_id INTEGER NULL REFERENCES Customers (id) ON DELETE CASCADE" in db.execute.call_args_list[-1].args[0]
+
+    db.fetch.side_effect = [
+        [(1, None, None, "a", 7), (2, None, None, "b", 7), (3, None, None, "c", None)],
+        [(7, None, None, "d", "Ada")],
+    ]
+    result = orders.find_many(prefetch=['customer'])
+
+    query, values = db.fetch.call_args.args
+    assert query == "SELECT id, date_created, date_last_edit, slug, name FROM Customers WHERE id = ANY(%s)"
+    assert values == ([7],)
+    assert result[0].related['customer'] is result[1].related['customer']
+    assert result[0].related['customer'].name == "Ada"
+    assert result[2].related['customer'] is None
+    db.fetch.side_effect, db.fetch.return_value = None, []
+    with pytest.raises(ValueError):
+        orders.find_many(prefetch=['invoice'])
+
+
+def test_indexes_from_field_and_model_config():
+    from pydantic import ConfigDict, Field
+
+    class Article(ObjectBaseModel):
+        model_config = ConfigDict(json_schema_extra={'indexes': [
+            ('author', 'year'),
+            {'columns': ['year'], 'where': 'year > 2000', 'name': 'recent_articles_idx'},
+        ]})
+        title: str = Field(index='trgm')
+        author: str = Field(index=True)
+        year: int
+
+    db = Mock()
+    table = Table(db, Article)
+    queries = [call.args[0] for call in db.execute.call_args_list]
+
+    assert "author TEXT NOT NULL" in queries[0]
+    assert "CREATE EXTENSION IF NOT EXISTS pg_trgm" in queries
+    assert "CREATE INDEX IF NOT EXISTS articles_title_trgm_idx ON Articles USING gin (title gin_trgm_ops)" in queries
+    assert "CREATE INDEX IF NOT EXISTS articles_author_btree_idx ON Articles USING btree (author)" in queries
+    assert "CREATE INDEX IF NOT EXISTS articles_author_year_btree_idx ON Articles USING btree (author, year)" in queries
+    assert "CREATE INDEX IF NOT EXISTS recent_articles_idx ON Articles USING btree (year) WHERE year > 2000" in queries
+
+
+def test_index_names_tell_partial_unique_and_long_indexes_apart():
+    from pydantic import ConfigDict, Field
+
+    class Article(ObjectBaseModel):
+        model_config = ConfigDict(json_schema_extra={'indexes': [
+            {'columns': ['year'], 'where': 'year > 2000'},
+            {'columns': ['year'], 'unique': True},
+            ('a_rather_long_column_name', 'another_rather_long_column_name'),
+        ]})
+        year: int = Field(index=True)
+        a_rather_long_column_name: str
+        another_rather_long_column_name: str
+
+    db = Mock()
+    table = Table(db, Article)
+    names = [table._index_name(index) for index in table.indexes]
+
+    assert names[0] == "articles_year_btree_idx"
+    assert len(set(names)) == 4
+    assert all(name.startswith("articles_year_btree_") for name in names[:3])
+    assert all(len(name) <= 63 for name in names)
+
+    queries = table._construct_queries_for_sync({'articles'}, set(names))
+    assert queries == []
+
+    class Duplicate(ObjectBaseModel):
+        model_config = ConfigDict(json_schema_extra={'indexes': [('year',)]})
+        year: int = Field(index=True)
+
+    with pytest.raises(ValueError):
+        Table(db, Duplicate)
+
+
+def test_read_cache_serves_repeats_and_invalidates_on_write():
+    db = Mock()
+    db.in_transaction.return_value = False
+    table = Table(db, Book, cache_size=2)
+    db.fetch.return_value = [(3,)]
+
+    assert table.count(author="A") == 3
+    assert table.count(author="A") == 3
+    assert db.fetch.call_count == 1
+
+    table.delete(Book(id=1, name="A", author="A", year=1))
+    assert table.count(author="A") == 3
+    assert db.fetch.call_count == 2
+
+    table.count(author="B")
+    table.count(author="C")
+    stats = table.cache_stats()
+    assert stats['hits'] == 1
+    assert stats['evictions'] == 1
+    assert stats['invalidations'] == 1
+
+
+def test_read_cache_is_bypassed_inside_transactions():
+    conn = MagicMock(closed=0)
+    with patch('psycopg2.connect', return_value=conn):
+        db = Database()
+    table = Table(db, Book, cache_size=8)
+    cursor = conn.cursor.return_value
+    cursor.fetchall.return_value = []
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            table.add(Book(name="Dune", author="Frank Herbert", year=1965))
+            cursor.fetchall.return_value = [(1, None, None, "slug", "Dune", "Frank Herbert", 1965)]
+            assert table.find_one(name="Dune").name == "Dune"
+            raise RuntimeError
+
+    # The rolled back row was never cached
+    cursor.fetchall.return_value = []
+    assert table.find_one(name="Dune") is None
+    assert table.cache_stats()['size'] == 1
+
+
+def test_read_cache_is_filled_from_the_primary_after_a_write():
+    conns = {host: MagicMock(closed=0) for host in ('primary', 'replica')}
+    with patch('psycopg2.connect', side_effect=lambda **kwargs: conns[kwargs['host']]):
+        db = Database(host='primary', replicas=[{'host': 'replica'}])
+    table = Table(db, Book, cache_size=8)
+    for conn in conns.values():
+        conn.cursor.return_value.fetchall.return_value = []
+        conn.cursor.return_value.__enter__.return_value.fetchall.return_value = []
+
+    def reads(host):
+        cursor = conns[host].cursor.return_value
+        calls = cursor.execute.call_args_list + cursor.__enter__.return_value.execute.call_args_list
+        return [call.args[0] for call in calls if call.args[0].startswith("SELECT")]
+
+    table.find_one(name="Dune")
+    assert len(reads('replica')) == 1
+
+    # A replica may lag behind the write, its rows must not end up cached
+    table.add(Book(name="Dune", author="Frank Herbert", year=1965))
+    table.find_one(name="Dune")
+    assert len(reads('primary')) == 1 and len(reads('replica')) == 1
+
+    # Once the window has passed, cache misses go to the replicas again
+    table._cache_cleared_at -= Table.CACHE_PRIMARY_WINDOW
+    table.find_one(name="Emma")
+    assert len(reads('primary')) == 1 and len(reads('replica')) == 2
+
+
+def test_replace_many_upserts_in_batches():
+    db, table = make_table()
+    books = [Book(id=i % 3, name=f"Book {i}", author="A", year=i) for i in range(5)]
+
+    assert table.replace_many(books, batch_size=2) == 3
+
+    query, rows = db.execute_many.call_args_list[0].args
+    assert query.startswith("INSERT INTO Books (id, date_created")
+    assert "VALUES %s ON CONFLICT (id) DO UPDATE SET" in query
+    assert [row[0] for row in rows] == [0, 1]
+    assert db.execute_many.call_count == 2
+
+
+def test_replace_many_uses_staging_table_and_copy():
+    db = MagicMock()
+    table = Table(db, Book)
+    db.reset_mock()
+    db.execute.return_value = 2
+    books = [Book(id=1, name='Say "hi"', author="A", year=1), Book(id=2, name="B", author="A", year=2)]
+
+    assert table.replace_many(books, copy_threshold=2) == 2
+
+    db.transaction.assert_called_once()
+    create, upsert, drop = [call.args[0] for call in db.execute.call_args_list]
+    assert create.startswith("CREATE TEMP TABLE books_staging (LIKE Books")
+    assert drop == "DROP TABLE books_staging"
+    copy_query, data = db.copy_in.call_args.args
+    assert copy_query.endswith("FROM STDIN WITH (FORMAT csv, NULL '\\N')")
+    assert '"Say ""hi"""' in data.getvalue()
+    assert "ON CONFLICT (id) DO UPDATE SET" in upsert
+
+
+def test_delete_where_returns_rowcount():
+    db, table = make_table()
+    db.execute.return_value = 4
+
+    assert table.delete_where(year={'lt': 2000}) == 4
+    assert db.execute.call_args.args == ("DELETE FROM Books WHERE year < %s", (2000,))
+    with pytest.raises(ValueError):
+        table.delete_where()
+
+
+def test_update_writes_only_changed_fields():
+    db, table = make_table()
+    db.fetch.return_value = [(5, None, None, "slug", "Dune", "Frank Herbert", 1965)]
+    db.execute.return_value = 1
+
+    book = table.find_one(id=5)
+    assert book.changed_fields == set()
+    assert table.update(book) == 0
+
+    book.year = 1966
+    assert table.update(book) == 1
+    query, data = db.execute.call_args.args
+    assert query == "UPDATE Books SET date_last_edit = %s, year = %s WHERE id = %s"
+    assert data[1:] == [1966, 5]
+    assert book.changed_fields == set()
+
+
+def test_update_where_sets_values_on_server():
+    db, table = make_table()
+    db.execute.return_value = 7
+
+    assert table.update_where({'author': 'X', 'year': {'lt': 1900}}, year=1900) == 7
+    query, values = db.execute.call_args.args
+    assert query == "UPDATE Books SET year = %s WHERE author = %s AND year < %s"
+    assert values == (1900, 'X', 1900)
+    with pytest.raises(ValueError):
+        table.update_where({'author': 'X'}, pages=10)
+
+
+def test_find_many_projection():
+    db, table = make_table()
+    db.fetch.return_value = [(1, "Dune")]
+
+    books = table.find_many(fields=['id', 'name'], author="Frank Herbert")
+    assert db.fetch.call_args.args[0] == "SELECT id, name FROM Books WHERE author = %s"
+    assert (books[0].id, books[0].name) == (1, "Dune")
+
+    db.fetch.return_value = [("Dune",)]
+    assert table.page(1, page_size=5, fields=['name'], as_='dicts') == [{'name': "Dune"}]
+    assert db.fetch.call_args.args[0] == "SELECT name FROM Books LIMIT %s OFFSET %s"
+
+    with pytest.raises(ValueError):
+        table.find_one(fields=['isbn'])
+
+
+def test_projected_models_only_hold_selected_fields():
+    db, table = make_table()
+    db.in_transaction.return_value = False
+    db.fetch.return_value = [(1, "Dune")]
+
+    book = table.find_one(fields=['id', 'name'])
+    assert isinstance(book, Book)
+    assert book.model_fields_set == {'id', 'name'}
+    # Unselected fields are not filled with made-up defaults such as a new slug
+    with pytest.raises(AttributeError):
+        book.slug
+    with pytest.raises(AttributeError):
+        book.year
+
+    with pytest.raises(ValueError):
+        table.replace(book)
+    with pytest.raises(ValueError):
+        table.replace_many([book])
+    with pytest.raises(ValueError):
+        table.add(book)
+
+    book.name = "Dune Messiah"
+    table.update(book)
+    query, values = db.execute.call_args.args
+    assert query == "UPDATE Books SET date_last_edit = %s, name = %s WHERE id = %s"
+    assert values[1:] == ["Dune Messiah", 1]
+
+
+def test_aggregate_groups_on_server():
+    db, table = make_table()
+    db.fetch.return_value = [("Frank Herbert", 6, 1975.5)]
+
+    rows = table.aggregate(group_by='author', count=True, avg='year', sort='-count', year={'gt': 1900})
+
+    query, values = db.fetch.call_args.args
+    assert query == (
+        "SELECT author, COUNT(*) AS count, AVG(year) AS avg_year FROM Books "
+        "WHERE year > %s GROUP BY author ORDER BY count DESC"
+    )
+    assert values == (1900,)
+    assert rows == [{'author': "Frank Herbert", 'count': 6, 'avg_year': 1975.5}]
+
+    with pytest.raises(ValueError):
+        table.aggregate(sum='pages')
+    with pytest.raises(ValueError):
+        table.aggregate(group_by='author')
+
+
+def test_export_streams_copy_to_stdout(tmp_path):
+    db, table = make_table()
+    db.copy_out.return_value = 2
+
+    assert table.export(tmp_path / "books.csv", fields=['id', 'name'], author="A") == 2
+
+    query, file, values = db.copy_out.call_args.args
+    assert query == "COPY (SELECT id, name FROM Books WHERE author = %s) TO STDOUT WITH (FORMAT csv, HEADER)"
+    assert values == ("A",)
+    assert file.mode == 'wb'
+    with pytest.raises(ValueError):
+        table.export(tmp_path / "books.json", format='json')
+
+
+def test_to_columns_builds_typed_arrays():
+    db, table = make_table()
+    db.stream.return_value = iter([[(1, "Dune", 1965), (2, "Emma", None)], [(3, "Ulysses", 1922)]])
+
+    columns = table.to_columns(fields=['id', 'name', 'year'], use_numpy=False)
+
+    assert columns['id'].typecode == 'q'
+    assert list(columns['id']) == [1, 2, 3]
+    assert columns['name'] == ["Dune", "Emma", "Ulysses"]
+    assert columns['year'] == [1965, None, 1922]
+
+
+def test_to_columns_returns_numpy_arrays():
+    np = pytest.importorskip("numpy")
+    db, table = make_table()
+    db.stream.return_value = iter([[(1, 1965), (2, 1813)]])
+
+    columns = table.to_columns(fields=['id', 'year'])
+
+    assert columns['year'].dtype == np.int64
+    assert columns['year'].tolist() == [1965, 1813]
+
+
+def test_parallel_map_splits_key_space_into_ranges():
+    from pydanql import parallel
+
+    assert parallel.split_range(1, 100, 4) == [(1, 26, False), (26, 51, False), (51, 76, False), (76, 100, True)]
+    assert parallel.split_range(5, 6, 8) == [(5, 6, False), (6, 6, True)]
+
+    db, table = make_table()
+    query, values = table._construct_query_for_key_range('id', last=True, author="A")
+    assert query == "SELECT id, date_created, date_last_edit, slug, name, author, year FROM Books WHERE author = %s AND id >= %s AND id <= %s ORDER BY id"
+    assert values == ["A"]
+
+    db.stream.return_value = iter([[(1, None, None, "a", "Dune", "Frank Herbert", 1965)]])
+    parallel._worker_table = table
+    try:
+        assert parallel.map_range((lambda book: book.name, query, ("A", 1, 10), 100)) == ["Dune"]
+    finally:
+        parallel._worker_table = None
+
+
+def test_partitioned_table_by_date_created():
+    from datetime import datetime
+    from pydantic import ConfigDict
+
+    class Event(ObjectBaseModel):
+        model_config = ConfigDict(json_schema_extra={'partition': {'interval': 'month', 'premake': 1, 'retention': 2}})
+        kind: str
+
+    db = MagicMock()
+    table = Table(db, Event)
+    queries = [call.args[0] for call in db.execute.call_args_list]
+
+    assert queries[0].startswith("CREATE TABLE IF NOT EXISTS Events (id SERIAL , ")
+    assert "slug TEXT NULL" in queries[0]
+    assert queries[0].endswith("PRIMARY KEY (id, date_created), UNIQUE (slug, date_created)) PARTITION BY RANGE (date_created);")
+    # The current and one premade partition, but no DEFAULT partition
+    assert [query.split(" FOR VALUES")[0] for query in queries[1:3]] == [
+        "CREATE TABLE IF NOT EXISTS events_p" + table._partition_start(datetime.now()).strftime('%Y%m') + " PARTITION OF Events",
+        "CREATE TABLE IF NOT EXISTS events_p" + table._partition_shift(table._partition_start(datetime.now()), 1).strftime('%Y%m') + " PARTITION OF Events",
+    ]
+    assert not any(query.endswith("DEFAULT") for query in queries)
+    assert table._construct_conflict_clause(['id', 'kind']) == "ON CONFLICT (id, date_created) DO UPDATE SET id = EXCLUDED.id, kind = EXCLUDED.kind"
+
+    db.reset_mock()
+    db.fetch.return_value = [("events_p202311",), ("events_p202312",), ("events_p202401",), ("events_default",)]
+    dropped = table.maintain_partitions(now=datetime(2024, 2, 15))
+
+    queries = [call.args[0] for call in db.execute.call_args_list]
+    assert "CREATE TABLE IF NOT EXISTS events_p202402 PARTITION OF Events FOR VALUES FROM ('2024-02-01') TO ('2024-03-01')" in queries
+    assert "CREATE TABLE IF NOT EXISTS events_p202403 PARTITION OF Events FOR VALUES FROM ('2024-03-01') TO ('2024-04-01')" in queries
+    assert dropped == ["events_p202311"]
+    assert "DROP TABLE IF EXISTS events_p202311" in queries